@@ -2,7 +2,7 @@ import os
 import secrets
 from functools import lru_cache
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -50,6 +50,9 @@ class Settings(BaseSettings):
     frontend_url: str = "http://localhost:5174"
     
     data_dir: Path = Field(default_factory=lambda: Path("./data"))
+    # SQLite URI used instead of data_dir/qumail.db when set, e.g.
+    # "file:qumail?mode=memory&cache=shared" for an in-memory test database.
+    db_uri: Optional[str] = None
     db_encryption_key: str = Field(default_factory=lambda: secrets.token_hex(32))
     
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
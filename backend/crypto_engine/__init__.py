@@ -3,6 +3,13 @@ import json
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 
+# pybase64 (optional) decodes with SIMD; output is identical.
+try:
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
+
+from utils import json_codec
 from .otp import otp_encrypt, otp_decrypt
 from .aes_gcm import aes_encrypt, aes_decrypt
 from .pqc import pqc_encrypt, pqc_decrypt
@@ -150,11 +157,11 @@ async def decrypt_attachment(
     try:
         # Check if it looks like JSON
         try:
-            envelope = json.loads(content)
+            envelope = json_codec.loads(content)
         except:
             # Maybe it's base64 encoded JSON
-            decoded = base64.b64decode(content)
-            envelope = json.loads(decoded)
+            decoded = b64decode(content)
+            envelope = json_codec.loads(decoded)
             
     except Exception:
         # Fallback to return raw if failed
@@ -209,24 +216,34 @@ async def _encrypt_otp(body: str, recipients: List[str]) -> Tuple[Dict[str, Any]
     }, None
 
 
-async def _encrypt_aes(body: str, recipients: List[str]) -> Tuple[Dict[str, Any], bytes]:
-    from qkd_client import request_key
+async def _request_recipient_keys(recipients: List[str]) -> Tuple[Dict[str, str], Any]:
+    """Fetch one 32-byte seed per recipient; returns ({recipient: key_id}, primary key).
     
-    recipient_keys = {}
-    primary_key_response = None
+    Multi-recipient sends use the KM batch endpoint so N recipients cost
+    one round-trip instead of N.
+    """
+    from qkd_client import request_key, request_keys_batch
     
-    logger.info("requesting keys for recipients: %s", recipients)
-    for recipient in recipients:
-        logger.info("requesting key for %s", recipient)
-        key_response = await request_key(
-            peer_id=recipient,
-            size=32,
-            key_type="aes_seed",
+    if len(recipients) == 1:
+        key_responses = [
+            await request_key(peer_id=recipients[0], size=32, key_type="aes_seed")
+        ]
+    else:
+        key_responses = await request_keys_batch(
+            [(recipient, 32, "aes_seed") for recipient in recipients]
         )
-        logger.info("received key response for %s", recipient)
-        recipient_keys[recipient] = key_response.key_id
-        if primary_key_response is None:
-            primary_key_response = key_response
+    
+    recipient_keys = {
+        recipient: key_response.key_id
+        for recipient, key_response in zip(recipients, key_responses)
+    }
+    
+    return recipient_keys, key_responses[0]
+
+
+async def _encrypt_aes(body: str, recipients: List[str]) -> Tuple[Dict[str, Any], bytes]:
+    logger.info("requesting keys for recipients: %s", recipients)
+    recipient_keys, primary_key_response = await _request_recipient_keys(recipients)
     
     logger.info("deriving key")
     aes_key = derive_key(primary_key_response.key_material, b"qumail-aes-encryption", 32)
@@ -257,7 +274,6 @@ async def _encrypt_aes(body: str, recipients: List[str]) -> Tuple[Dict[str, Any]
 
 
 async def _encrypt_pqc(body: str, recipients: List[str]) -> Tuple[Dict[str, Any], bytes]:
-    from qkd_client import request_key
     from storage.database import get_known_recipient
     from .pqc import dilithium_sign, generate_dilithium_keypair, pqc_encrypt
     from key_store import get_private_key, store_private_key, get_public_key
@@ -272,18 +288,7 @@ async def _encrypt_pqc(body: str, recipients: List[str]) -> Tuple[Dict[str, Any]
         recipient_public_key,
     )
     
-    recipient_keys = {}
-    primary_key_response = None
-    
-    for r in recipients:
-        key_response = await request_key(
-            peer_id=r,
-            size=32,
-            key_type="aes_seed",
-        )
-        recipient_keys[r] = key_response.key_id
-        if primary_key_response is None:
-            primary_key_response = key_response
+    recipient_keys, primary_key_response = await _request_recipient_keys(recipients)
     
     combined_key = derive_key(
         shared_secret + primary_key_response.key_material,
@@ -423,13 +428,13 @@ async def _decrypt_otp(ciphertext_b64: str, key_id: str, metadata: dict) -> Tupl
     from qkd_client import get_key, consume_key
     
     try:
-        envelope_json = base64.b64decode(ciphertext_b64)
-        envelope = json.loads(envelope_json)
+        envelope_json = b64decode(ciphertext_b64)
+        envelope = json_codec.loads(envelope_json)
     except Exception:
         return "", None
         
     actual_key_id = envelope.get("key_id", key_id)
-    ct_bytes = base64.b64decode(envelope["ciphertext"])
+    ct_bytes = b64decode(envelope["ciphertext"])
     
     key_response = await get_key(actual_key_id)
     plaintext_bytes = otp_decrypt(ct_bytes, key_response.key_material)
@@ -445,17 +450,17 @@ async def _decrypt_otp(ciphertext_b64: str, key_id: str, metadata: dict) -> Tupl
 async def _decrypt_aes(ciphertext_b64: str, key_id: str, metadata: dict) -> Tuple[str, bytes]:
     from qkd_client import get_key
     
-    envelope_json = base64.b64decode(ciphertext_b64)
-    envelope = json.loads(envelope_json)
+    envelope_json = b64decode(ciphertext_b64)
+    envelope = json_codec.loads(envelope_json)
     
     actual_key_id = envelope.get("key_id", key_id)
     key_response = await get_key(actual_key_id)
     
     aes_key = derive_key(key_response.key_material, b"qumail-aes-encryption", 32)
     
-    nonce = base64.b64decode(envelope["nonce"])
-    tag = base64.b64decode(envelope["tag"])
-    ct = base64.b64decode(envelope["ciphertext"])
+    nonce = b64decode(envelope["nonce"])
+    tag = b64decode(envelope["tag"])
+    ct = b64decode(envelope["ciphertext"])
     
     plaintext_bytes = aes_decrypt(ct, aes_key, nonce, tag)
     
@@ -469,8 +474,8 @@ async def _decrypt_pqc(ciphertext_b64: str, key_id: str, metadata: dict, sender:
     from storage.database import get_known_recipient
     import re
     
-    envelope_json = base64.b64decode(ciphertext_b64)
-    envelope = json.loads(envelope_json)
+    envelope_json = b64decode(ciphertext_b64)
+    envelope = json_codec.loads(envelope_json)
     
     if envelope.get("signature") and sender:
          match = re.search(r'<([^>]+)>', sender)
@@ -480,18 +485,18 @@ async def _decrypt_pqc(ciphertext_b64: str, key_id: str, metadata: dict, sender:
          if sender_info and sender_info.get("signing_key"):
              public_key = sender_info["signing_key"]
              
-             aes_ct = base64.b64decode(envelope["ciphertext"])
-             nonce = base64.b64decode(envelope["nonce"])
-             tag = base64.b64decode(envelope["tag"])
+             aes_ct = b64decode(envelope["ciphertext"])
+             nonce = b64decode(envelope["nonce"])
+             tag = b64decode(envelope["tag"])
              message_hash = aes_ct + nonce + tag
              
-             signature = base64.b64decode(envelope["signature"])
+             signature = b64decode(envelope["signature"])
              
              if not dilithium_verify(message_hash, signature, public_key):
                  logger.error("Dilithium signature verification failed for sender %s", sender)
 
     target_key_id = envelope.get("key_id", key_id)
-    encapsulated_key = base64.b64decode(envelope["encapsulated_key"])
+    encapsulated_key = b64decode(envelope["encapsulated_key"])
     private_key = await get_private_key("pqc")
     shared_secret = pqc_decrypt(encapsulated_key, private_key)
     
@@ -502,16 +507,16 @@ async def _decrypt_pqc(ciphertext_b64: str, key_id: str, metadata: dict, sender:
         32,
     )
     
-    nonce = base64.b64decode(envelope["nonce"])
-    tag = base64.b64decode(envelope["tag"])
-    ciphertext = base64.b64decode(envelope["ciphertext"])
+    nonce = b64decode(envelope["nonce"])
+    tag = b64decode(envelope["tag"])
+    ciphertext = b64decode(envelope["ciphertext"])
     
     try:
         plaintext_bytes = aes_decrypt(ciphertext, combined_key, nonce, tag)
     except Exception as e:
         if "sender_encap" in envelope and "sender_enc_ck" in envelope:
-            sender_encap = base64.b64decode(envelope["sender_encap"])
-            sender_enc_ck_full = base64.b64decode(envelope["sender_enc_ck"])
+            sender_encap = b64decode(envelope["sender_encap"])
+            sender_enc_ck_full = b64decode(envelope["sender_enc_ck"])
             ck_nonce = sender_enc_ck_full[:12]
             ck_tag = sender_enc_ck_full[12:28]
             enc_ck = sender_enc_ck_full[28:]
@@ -531,7 +536,7 @@ async def _decrypt_pqc(ciphertext_b64: str, key_id: str, metadata: dict, sender:
 async def _decrypt_otp_bytes(envelope: Dict[str, Any], key_id: str) -> bytes:
     from qkd_client import get_key
     
-    ciphertext = base64.b64decode(envelope["ciphertext"])
+    ciphertext = b64decode(envelope["ciphertext"])
     target_key_id = envelope.get("key_id", key_id)
     
     key_response = await get_key(target_key_id)
@@ -545,9 +550,9 @@ async def _decrypt_aes_bytes(envelope: Dict[str, Any], key_id: str) -> bytes:
     key_response = await get_key(target_key_id)
     aes_key = derive_key(key_response.key_material, b"qumail-attachment", 32)
     
-    nonce = base64.b64decode(envelope["nonce"])
-    tag = base64.b64decode(envelope["tag"])
-    ciphertext = base64.b64decode(envelope["ciphertext"])
+    nonce = b64decode(envelope["nonce"])
+    tag = b64decode(envelope["tag"])
+    ciphertext = b64decode(envelope["ciphertext"])
     
     return aes_decrypt(ciphertext, aes_key, nonce, tag)
 
@@ -558,7 +563,7 @@ async def _decrypt_pqc_bytes(envelope: Dict[str, Any], key_id: str) -> bytes:
     
     target_key_id = envelope.get("key_id", key_id)
     
-    encapsulated_key = base64.b64decode(envelope["encapsulated_key"])
+    encapsulated_key = b64decode(envelope["encapsulated_key"])
     private_key = await get_private_key("pqc")
     shared_secret = pqc_decrypt(encapsulated_key, private_key)
     
@@ -570,16 +575,16 @@ async def _decrypt_pqc_bytes(envelope: Dict[str, Any], key_id: str) -> bytes:
         32,
     )
     
-    nonce = base64.b64decode(envelope["nonce"])
-    tag = base64.b64decode(envelope["tag"])
-    ciphertext = base64.b64decode(envelope["ciphertext"])
+    nonce = b64decode(envelope["nonce"])
+    tag = b64decode(envelope["tag"])
+    ciphertext = b64decode(envelope["ciphertext"])
     
     try:
         return aes_decrypt(ciphertext, combined_key, nonce, tag)
     except Exception as e:
         if "sender_encap" in envelope and "sender_enc_ck" in envelope:
-            sender_encap = base64.b64decode(envelope["sender_encap"])
-            sender_enc_ck_full = base64.b64decode(envelope["sender_enc_ck"])
+            sender_encap = b64decode(envelope["sender_encap"])
+            sender_enc_ck_full = b64decode(envelope["sender_enc_ck"])
             ck_nonce = sender_enc_ck_full[:12]
             ck_tag = sender_enc_ck_full[12:28]
             enc_ck = sender_enc_ck_full[28:]
@@ -1,5 +1,41 @@
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+import hmac
+
+# HKDF-SHA256 (RFC 5869) on the stdlib hmac module: the hashing itself runs in
+# OpenSSL, and the PRK-keyed HMAC state is prepared once and copied for every
+# Expand block instead of being re-keyed.
+_HASH_LEN = 32
+_ZERO_SALT = bytes(_HASH_LEN)
+
+
+def _check_length(length: int) -> None:
+    if length <= 0 or length > 255 * _HASH_LEN:
+        raise ValueError(f"Invalid key length: {length}")
+
+
+def _hkdf_extract(input_key_material: bytes, salt: bytes = b"") -> hmac.HMAC:
+    if not input_key_material:
+        raise ValueError("Input key material cannot be empty")
+    
+    prk = hmac.digest(salt or _ZERO_SALT, input_key_material, "sha256")
+    return hmac.new(prk, digestmod="sha256")
+
+
+def _hkdf_expand(prk_mac: hmac.HMAC, info: bytes, length: int) -> bytes:
+    if length <= _HASH_LEN:
+        # Single block: T(1) = HMAC(PRK, info || 0x01), no chaining needed.
+        mac = prk_mac.copy()
+        mac.update(info + b"\x01")
+        return mac.digest()[:length]
+    
+    okm = b""
+    block = b""
+    for counter in range(1, -(-length // _HASH_LEN) + 1):
+        mac = prk_mac.copy()
+        mac.update(block + info + bytes((counter,)))
+        block = mac.digest()
+        okm += block
+    
+    return okm[:length]
 
 
 def derive_key(
@@ -8,20 +44,10 @@ def derive_key(
     length: int,
     salt: bytes = b"",
 ) -> bytes:
-    if not input_key_material:
-        raise ValueError("Input key material cannot be empty")
+    prk_mac = _hkdf_extract(input_key_material, salt)
+    _check_length(length)
     
-    if length <= 0 or length > 255 * 32:
-        raise ValueError(f"Invalid key length: {length}")
-    
-    hkdf = HKDF(
-        algorithm=hashes.SHA256(),
-        length=length,
-        salt=salt if salt else None,
-        info=context,
-    )
-    
-    return hkdf.derive(input_key_material)
+    return _hkdf_expand(prk_mac, context, length)
 
 
 def derive_multiple_keys(
@@ -29,18 +55,23 @@ def derive_multiple_keys(
     contexts: list[tuple[bytes, int]],
     salt: bytes = b"",
 ) -> list[bytes]:
-    return [
-        derive_key(input_key_material, context, length, salt)
-        for context, length in contexts
-    ]
+    # Every context shares one Extract step.
+    prk_mac = _hkdf_extract(input_key_material, salt)
+    for _, length in contexts:
+        _check_length(length)
+    
+    return [_hkdf_expand(prk_mac, context, length) for context, length in contexts]
 
 
 def derive_email_keys(qkd_key: bytes, email_id: str) -> dict:
     base_context = f"qumail-email-{email_id}".encode()
     
-    encryption_key = derive_key(qkd_key, base_context + b"-enc", 32)
-    mac_key = derive_key(qkd_key, base_context + b"-mac", 32)
-    iv_seed = derive_key(qkd_key, base_context + b"-iv", 16)
+    # All three sub-keys come from the same IKM, so extract the PRK once.
+    prk_mac = _hkdf_extract(qkd_key)
+    
+    encryption_key = _hkdf_expand(prk_mac, base_context + b"-enc", 32)
+    mac_key = _hkdf_expand(prk_mac, base_context + b"-mac", 32)
+    iv_seed = _hkdf_expand(prk_mac, base_context + b"-iv", 16)
     
     return {
         "encryption_key": encryption_key,
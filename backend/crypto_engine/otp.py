@@ -1,23 +1,82 @@
 import hmac
-import hashlib
 from typing import Tuple
 
+import numpy as np
 
-def otp_encrypt(plaintext: bytes, key: bytes) -> bytes:
+try:
+    from numba import njit, prange, types
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+# Numba's thread pool only pays for itself on large buffers (attachments);
+# below this the single-threaded NumPy XOR is already memory bound.
+_PARALLEL_XOR_MIN_BYTES = 1 << 20
+
+# Short payloads XOR faster as one bignum operation than through NumPy's
+# per-call array setup; measured crossover is a few hundred bytes.
+_BIGNUM_XOR_MAX_BYTES = 256
+
+if _HAS_NUMBA:
+    _READONLY_U8 = types.Array(types.uint8, 1, "C", readonly=True)
+
+    # The explicit signature compiles at import (and cache=True keeps the
+    # result on disk), so the first encryption does not pay for the JIT.
+    @njit(
+        types.void(_READONLY_U8, _READONLY_U8, types.uint8[::1]),
+        parallel=True,
+        cache=True,
+        boundscheck=False,
+    )
+    def _xor_kernel(a, b, out):
+        for i in prange(a.shape[0]):
+            out[i] = a[i] ^ b[i]
+
+    # One tiny call at import starts Numba's parallel thread pool, so the
+    # first large attachment doesn't pay for it.
+    _warmup = np.zeros(1, dtype=np.uint8)
+    _warmup.flags.writeable = False
+    _xor_kernel(_warmup, _warmup, np.empty(1, dtype=np.uint8))
+    del _warmup
+
+
+def _otp_xor(plaintext: bytes, key: bytes) -> np.ndarray:
     if len(key) < len(plaintext):
         raise ValueError(
             f"OTP key length ({len(key)}) must be >= plaintext length ({len(plaintext)}). "
             "This is a fundamental requirement of One-Time Pad encryption."
         )
     
-    if len(key) > len(plaintext):
-        key = key[:len(plaintext)]
+    # frombuffer views the inputs without copying and count= trims the pad
+    # without slicing it.
+    data = np.frombuffer(plaintext, dtype=np.uint8)
+    pad = np.frombuffer(key, dtype=np.uint8, count=len(plaintext))
     
-    ciphertext = bytes(p ^ k for p, k in zip(plaintext, key))
+    if _HAS_NUMBA and len(plaintext) >= _PARALLEL_XOR_MIN_BYTES:
+        # Views of a bytearray are writable; the kernel is compiled for
+        # read-only inputs only.
+        data.flags.writeable = False
+        pad.flags.writeable = False
+        ciphertext = np.empty(len(plaintext), dtype=np.uint8)
+        _xor_kernel(data, pad, ciphertext)
+    else:
+        ciphertext = np.bitwise_xor(data, pad)
     
     return ciphertext
 
 
+def otp_encrypt(plaintext: bytes, key: bytes) -> bytes:
+    if not plaintext:
+        return b""
+    
+    size = len(plaintext)
+    if size <= _BIGNUM_XOR_MAX_BYTES and len(key) >= size:
+        pad = int.from_bytes(memoryview(key)[:size], "big")
+        return (int.from_bytes(plaintext, "big") ^ pad).to_bytes(size, "big")
+    
+    return _otp_xor(plaintext, key).tobytes()
+
+
 def otp_decrypt(ciphertext: bytes, key: bytes) -> bytes:
     return otp_encrypt(ciphertext, key)
 
@@ -30,11 +89,12 @@ def otp_encrypt_with_mac(
     if len(mac_key) < 32:
         raise ValueError("MAC key must be at least 32 bytes")
     
-    ciphertext = otp_encrypt(plaintext, encryption_key)
+    # MAC the XOR output buffer directly; it is copied out to bytes once.
+    ciphertext = _otp_xor(plaintext, encryption_key)
     
-    mac = hmac.new(mac_key, ciphertext, hashlib.sha256).digest()
+    mac = hmac.digest(mac_key, memoryview(ciphertext), "sha256")
     
-    return ciphertext, mac
+    return ciphertext.tobytes(), mac
 
 
 def otp_decrypt_with_mac(
@@ -43,7 +103,7 @@ def otp_decrypt_with_mac(
     encryption_key: bytes,
     mac_key: bytes,
 ) -> bytes:
-    expected_mac = hmac.new(mac_key, ciphertext, hashlib.sha256).digest()
+    expected_mac = hmac.digest(mac_key, ciphertext, "sha256")
     
     if not hmac.compare_digest(mac, expected_mac):
         raise ValueError("MAC verification failed - message may have been tampered with")
@@ -57,14 +117,14 @@ def verify_otp_security(key: bytes, plaintext_length: int) -> dict:
     if len(key) < plaintext_length:
         issues.append(f"Key too short: {len(key)} < {plaintext_length}")
     
-    if len(set(key)) < min(len(key) // 4, 64):
-        issues.append("Key appears to have low entropy (many repeated bytes)")
+    # One 256-bin histogram answers both the distinct-byte and the
+    # most-frequent-byte checks.
+    byte_counts = np.bincount(np.frombuffer(key, dtype=np.uint8), minlength=256)
     
-    byte_counts = {}
-    for b in key:
-        byte_counts[b] = byte_counts.get(b, 0) + 1
+    if np.count_nonzero(byte_counts) < min(len(key) // 4, 64):
+        issues.append("Key appears to have low entropy (many repeated bytes)")
     
-    max_count = max(byte_counts.values()) if byte_counts else 0
+    max_count = int(byte_counts.max())
     if max_count > len(key) * 0.1:
         issues.append(f"Key has suspicious byte distribution (max: {max_count}/{len(key)})")
     
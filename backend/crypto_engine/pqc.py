@@ -3,7 +3,8 @@ import hmac
 import logging
 import os
 import threading
-from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -42,18 +43,24 @@ if not _OQS_AVAILABLE and _DEV_MODE:
 KYBER_VARIANT = "Kyber768"
 DILITHIUM_VARIANT = "Dilithium3"
 
+# Kyber768 key sizes used for the simulated keypairs.
+_SIM_KYBER_PUBLIC_KEY_BYTES = 1184
+_SIM_KYBER_SECRET_KEY_BYTES = 2400
+
 _simulation_cache_lock = threading.RLock()
-_kyber_cache: Dict[bytes, bytes] = {}
+# LRU of shared secrets keyed by a 16-byte BLAKE2b digest of the ciphertext
+# rather than the 1088-byte ciphertext itself.
+_kyber_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
 _dilithium_cache: Dict[bytes, Tuple[bytes, bytes]] = {}
 
 MAX_CACHE_SIZE = 10000
 
 
+def _kyber_cache_key(ciphertext: bytes) -> bytes:
+    return hashlib.blake2b(ciphertext, digest_size=16).digest()
+
+
 def _cache_cleanup():
-    if len(_kyber_cache) > MAX_CACHE_SIZE:
-        keys_to_remove = list(_kyber_cache.keys())[:MAX_CACHE_SIZE // 2]
-        for k in keys_to_remove:
-            _kyber_cache.pop(k, None)
     if len(_dilithium_cache) > MAX_CACHE_SIZE:
         keys_to_remove = list(_dilithium_cache.keys())[:MAX_CACHE_SIZE // 2]
         for k in keys_to_remove:
@@ -65,8 +72,8 @@ class SimulatedKyber:
     def __init__(self):
         if not _DEV_MODE:
             raise RuntimeError("Simulated Kyber accessed in non-dev mode!")
-        self.public_key = os.urandom(1184)
-        self.secret_key = os.urandom(2400)
+        self.public_key = os.urandom(_SIM_KYBER_PUBLIC_KEY_BYTES)
+        self.secret_key = os.urandom(_SIM_KYBER_SECRET_KEY_BYTES)
     
     def generate_keypair(self) -> Tuple[bytes, bytes]:
         return self.public_key, self.secret_key
@@ -74,16 +81,20 @@ class SimulatedKyber:
     def encap(self, public_key: bytes) -> Tuple[bytes, bytes]:
         ciphertext = os.urandom(1088)
         shared_secret = os.urandom(32)
+        cache_key = _kyber_cache_key(ciphertext)
         with _simulation_cache_lock:
-            _cache_cleanup()
-            _kyber_cache[ciphertext] = shared_secret
+            _kyber_cache[cache_key] = shared_secret
+            if len(_kyber_cache) > MAX_CACHE_SIZE:
+                _kyber_cache.popitem(last=False)
         logger.debug("Simulated Kyber encap: cached shared_secret for ciphertext")
         return ciphertext, shared_secret
     
     def decap(self, ciphertext: bytes, secret_key: bytes) -> bytes:
+        cache_key = _kyber_cache_key(ciphertext)
         with _simulation_cache_lock:
-            if ciphertext in _kyber_cache:
-                shared_secret = _kyber_cache[ciphertext]
+            shared_secret = _kyber_cache.get(cache_key)
+            if shared_secret is not None:
+                _kyber_cache.move_to_end(cache_key)
                 logger.debug("Simulated Kyber decap: retrieved shared_secret from cache")
                 return shared_secret
         logger.warning("Simulated Kyber decap: ciphertext not in cache, using deterministic fallback")
@@ -129,6 +140,35 @@ def generate_kyber_keypair() -> Tuple[bytes, bytes]:
         return sim.generate_keypair()
 
 
+def generate_kyber_keypairs(n: int) -> List[Tuple[bytes, bytes]]:
+    """Generate ``n`` keypairs at once.
+    
+    Native mode reuses one KEM object for every pair; simulated mode draws
+    all of the key material with a single os.urandom call and slices it.
+    """
+    if n <= 0:
+        return []
+    
+    if _OQS_AVAILABLE:
+        kem = _oqs.KeyEncapsulation(KYBER_VARIANT)
+        pairs = []
+        for _ in range(n):
+            public_key = kem.generate_keypair()
+            pairs.append((public_key, kem.export_secret_key()))
+        return pairs
+    
+    if not _DEV_MODE:
+        raise RuntimeError("Simulated Kyber accessed in non-dev mode!")
+    
+    pub_len = _SIM_KYBER_PUBLIC_KEY_BYTES
+    pair_len = pub_len + _SIM_KYBER_SECRET_KEY_BYTES
+    with memoryview(os.urandom(n * pair_len)) as material:
+        return [
+            (bytes(material[off:off + pub_len]), bytes(material[off + pub_len:off + pair_len]))
+            for off in range(0, n * pair_len, pair_len)
+        ]
+
+
 def kyber_encapsulate(public_key: bytes) -> Tuple[bytes, bytes]:
     if _OQS_AVAILABLE:
         kem = _oqs.KeyEncapsulation(KYBER_VARIANT)
@@ -71,8 +71,7 @@ class EntropyPool:
         conditioned = self._condition_entropy(combined)
         
         with self._lock:
-            for i in range(min(len(conditioned), ENTROPY_POOL_SIZE)):
-                self._pool[i] = conditioned[i]
+            self._pool[:] = conditioned
         
         logger.info(
             "Entropy pool initialized with %d sources: %s",
@@ -139,15 +138,16 @@ class EntropyPool:
         return bytes(result)
     
     def _condition_entropy(self, raw_entropy: bytes) -> bytes:
-        result = bytearray(ENTROPY_POOL_SIZE)
+        # Absorb the raw sources once; each output block only adds its index.
+        base = hashlib.blake2b(raw_entropy, digest_size=64)
+        result = bytearray()
         
         for i in range(0, ENTROPY_POOL_SIZE, 64):
-            block_input = raw_entropy + i.to_bytes(4, 'little')
-            block = hashlib.blake2b(block_input, digest_size=64).digest()
-            chunk_size = min(64, ENTROPY_POOL_SIZE - i)
-            result[i:i + chunk_size] = block[:chunk_size]
+            block = base.copy()
+            block.update(i.to_bytes(4, 'little'))
+            result += block.digest()
         
-        return bytes(result)
+        return bytes(result[:ENTROPY_POOL_SIZE])
     
     def reseed(self) -> None:
         new_entropy = []
@@ -164,8 +164,7 @@ class EntropyPool:
             combined = bytes(self._pool) + b"".join(new_entropy)
             conditioned = self._condition_entropy(combined)
             
-            for i in range(ENTROPY_POOL_SIZE):
-                self._pool[i] = conditioned[i]
+            self._pool[:] = conditioned
             
             self._bytes_since_reseed = 0
             self._reseed_count += 1
@@ -185,14 +184,16 @@ class EntropyPool:
             counter = 0
             
             while offset < size:
-                block_input = bytes(self._pool) + struct.pack("<Q", counter)
-                block = hashlib.blake2b(block_input, digest_size=64).digest()
+                block = hashlib.blake2b(self._pool + struct.pack("<Q", counter), digest_size=64).digest()
                 
                 chunk_size = min(32, size - offset)
                 output[offset:offset + chunk_size] = block[:chunk_size]
                 
-                for i in range(ENTROPY_POOL_SIZE):
-                    self._pool[i] ^= block[32 + (i % 32)]
+                # Fold the second half of the block back over the whole pool
+                # (pool[i] ^= block[32 + i % 32]) as one big-int XOR.
+                mask = block[32:] * (ENTROPY_POOL_SIZE // 32)
+                folded = int.from_bytes(self._pool, "little") ^ int.from_bytes(mask, "little")
+                self._pool[:] = folded.to_bytes(ENTROPY_POOL_SIZE, "little")
                 
                 offset += chunk_size
                 counter += 1
@@ -238,6 +239,7 @@ class ChaCha20CSPRNG:
         self._counter = 0
         self._bytes_generated = 0
         self._reseed_threshold = 64 * 1024
+        self._stream = None
         
         self._reseed()
     
@@ -252,50 +254,75 @@ class ChaCha20CSPRNG:
             
             self._counter = 0
             self._bytes_generated = 0
+            # One keystream per seed: every call continues where the last
+            # one stopped instead of rebuilding the cipher (and restarting
+            # the same keystream) each time.
+            self._stream = self._new_encryptor() if HAS_CRYPTOGRAPHY else None
     
     def generate(self, size: int) -> bytes:
-        logger.info("[CSPRNG] generate called with size=%d", size)
         if size <= 0:
             raise ValueError("Size must be positive")
         
-        logger.info("[CSPRNG] waiting for lock in generate")
         with self._lock:
-            logger.info("[CSPRNG] acquired lock in generate")
             if self._bytes_generated >= self._reseed_threshold:
-                logger.info("[CSPRNG] reseeding...")
                 self._reseed()
             
-            logger.info("[CSPRNG] actually generating %d bytes, HAS_CRYPTOGRAPHY=%s", size, HAS_CRYPTOGRAPHY)
             if HAS_CRYPTOGRAPHY:
                 output = self._generate_chacha20(size)
             else:
                 output = self._generate_fallback(size)
             
             self._bytes_generated += size
-            self._counter += 1
             
-            logger.info("[CSPRNG] generate complete")
             return output
     
-    def _generate_chacha20(self, size: int) -> bytes:
+    def generate_into(self, buf) -> int:
+        """Fill a writable buffer with random bytes, without an intermediate copy.
+        
+        Returns the number of bytes written.
+        """
+        with memoryview(buf) as view, view.cast("B") as out:
+            size = out.nbytes
+            if size <= 0:
+                raise ValueError("Size must be positive")
+            
+            with self._lock:
+                if self._bytes_generated >= self._reseed_threshold:
+                    self._reseed()
+                
+                if HAS_CRYPTOGRAPHY:
+                    self._stream.update_into(bytes(size), out)
+                else:
+                    out[:] = self._generate_fallback(size)
+                
+                self._bytes_generated += size
+                return size
+    
+    def _new_encryptor(self):
         nonce = bytes(self._nonce)
         cipher = Cipher(
             algorithms.ChaCha20(bytes(self._key), nonce),
             mode=None,
             backend=default_backend()
         )
-        encryptor = cipher.encryptor()
-        
-        plaintext = b"\x00" * size
-        return encryptor.update(plaintext)
+        return cipher.encryptor()
+    
+    def _generate_chacha20(self, size: int) -> bytes:
+        # OpenSSL's ChaCha20 already selects its AVX2/AVX-512 multi-block
+        # code at runtime, so the keystream is just zeros run through it.
+        return self._stream.update(bytes(size))
     
     def _generate_fallback(self, size: int) -> bytes:
         output = bytearray(size)
         offset = 0
         counter = self._counter
         
+        # key || nonce || counter, with only the counter rewritten per block.
+        block_input = self._key + self._nonce + bytes(8)
+        counter_offset = len(block_input) - 8
+        
         while offset < size:
-            block_input = bytes(self._key) + bytes(self._nonce) + struct.pack("<Q", counter)
+            struct.pack_into("<Q", block_input, counter_offset, counter)
             block = hashlib.blake2b(block_input, digest_size=64).digest()
             
             chunk_size = min(64, size - offset)
@@ -304,6 +331,7 @@ class ChaCha20CSPRNG:
             offset += chunk_size
             counter += 1
         
+        self._counter = counter
         return bytes(output)
     
     def get_stats(self) -> dict:
@@ -343,6 +371,11 @@ def generate_quantum_bytes(size: int) -> bytes:
     return csprng.generate(size)
 
 
+def generate_quantum_bytes_into(buf) -> int:
+    csprng = _ensure_initialized()
+    return csprng.generate_into(buf)
+
+
 def generate_quantum_key(size: int = 32) -> Tuple[bytes, str]:
     key_material = generate_quantum_bytes(size)
     key_id = secrets.token_hex(16)
@@ -1,6 +1,7 @@
 import logging
 import os
 import secrets
+import threading
 from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
@@ -10,6 +11,7 @@ _use_quantum_sim = True
 try:
     from .quantum_sim import (
         generate_quantum_bytes,
+        generate_quantum_bytes_into,
         generate_quantum_key,
         get_entropy_stats,
         health_check as entropy_health_check,
@@ -20,17 +22,63 @@ except ImportError as e:
     logger.warning("Quantum sim not available, falling back to os.urandom: %s", e)
     _use_quantum_sim = False
 
+# Key/nonce/salt-sized requests are sliced from a buffer refilled with one
+# CSPRNG call, instead of paying a generate() call for each 32 bytes.
+_SMALL_REQUEST_MAX = 64
+_SMALL_POOL_SIZE = 4096
+_small_pool = bytearray(_SMALL_POOL_SIZE)
+_small_pool_pos = _SMALL_POOL_SIZE
+_small_pool_lock = threading.Lock()
+
+
+def _discard_small_pool() -> None:
+    # A forked child must not hand out the same buffered bytes as its parent.
+    global _small_pool_pos
+    _small_pool_pos = _SMALL_POOL_SIZE
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_discard_small_pool)
+
+
+def _small_random_bytes(length: int) -> bytes:
+    global _small_pool_pos
+    with _small_pool_lock:
+        start = _small_pool_pos
+        if start + length > _SMALL_POOL_SIZE:
+            generate_quantum_bytes_into(_small_pool)
+            start = 0
+        end = start + length
+        _small_pool_pos = end
+        
+        output = bytes(_small_pool[start:end])
+        _small_pool[start:end] = bytes(length)
+        return output
+
 
 def secure_random_bytes(length: int) -> bytes:
     if length <= 0:
         raise ValueError("Length must be positive")
     
     if _use_quantum_sim:
+        if length <= _SMALL_REQUEST_MAX:
+            return _small_random_bytes(length)
         return generate_quantum_bytes(length)
     
     return os.urandom(length)
 
 
+def secure_random_into(buf) -> int:
+    if _use_quantum_sim:
+        return generate_quantum_bytes_into(buf)
+    
+    with memoryview(buf) as view, view.cast("B") as out:
+        if out.nbytes <= 0:
+            raise ValueError("Length must be positive")
+        out[:] = os.urandom(out.nbytes)
+        return out.nbytes
+
+
 def secure_random_hex(length: int) -> str:
     byte_length = (length + 1) // 2
     return secrets.token_hex(byte_length)[:length]
@@ -58,8 +106,8 @@ def generate_key_id() -> str:
 
 
 def zeroize(data: bytearray) -> None:
-    for i in range(len(data)):
-        data[i] = 0
+    # One in-place memset-style store instead of a Python loop per byte.
+    data[:] = bytes(len(data))
 
 
 def generate_encryption_key(size: int = 32) -> Tuple[bytes, str]:
@@ -1,6 +1,7 @@
 import base64
 import logging
-from datetime import datetime, timezone
+import time
+from datetime import datetime
 
 import httpx
 
@@ -26,33 +27,34 @@ async def get_valid_token(email: str, force_refresh: bool = False) -> str:
     if not tokens:
         raise ValueError(f"No OAuth tokens for {email}. Please authenticate.")
     
-    provider = tokens.get("provider") or detect_provider(email)
+    provider = detect_provider(email)
     should_refresh = force_refresh
     
-    if not should_refresh and tokens.get("expires_at"):
-        expires_at = tokens["expires_at"]
+    if not should_refresh and tokens.expires_at:
+        expires_at = tokens.expires_at
         if isinstance(expires_at, str):
-            expires_at = datetime.fromisoformat(expires_at)
+            # Rows written before expires_at became epoch seconds hold ISO text.
+            expires_at = datetime.fromisoformat(expires_at).timestamp()
         
-        if datetime.now(timezone.utc) >= expires_at:
+        if time.time() >= expires_at:
             logger.info("Access token expired for %s, refreshing...", email)
             should_refresh = True
             
     if should_refresh:
         logger.info("Refreshing OAuth token for %s (provider=%s, force=%s)", email, provider, force_refresh)
-        new_tokens = await refresh_oauth_token(tokens["refresh_token"], provider)
+        new_tokens = await refresh_oauth_token(tokens.refresh_token, provider)
         
         await store_oauth_tokens(
             email=email,
             access_token=new_tokens["access_token"],
-            refresh_token=new_tokens.get("refresh_token", tokens["refresh_token"]),
+            refresh_token=new_tokens.get("refresh_token", tokens.refresh_token),
             expires_in=new_tokens.get("expires_in", 3600),
             provider=provider,
         )
         
         return new_tokens["access_token"]
     
-    return tokens["access_token"]
+    return tokens.access_token
 
 
 async def refresh_oauth_token(refresh_token: str, provider: str = "gmail") -> dict:
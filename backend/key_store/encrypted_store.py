@@ -173,8 +173,7 @@ class EncryptedKeyStore:
     
     def _zeroize(self, data: bytearray) -> None:
         """Securely overwrite sensitive data in memory."""
-        for i in range(len(data)):
-            data[i] = 0
+        data[:] = bytes(len(data))
     
     def _secure_delete(self, path: Path) -> None:
         """Attempt secure deletion by overwriting before unlinking."""
@@ -1,19 +1,29 @@
 import logging
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from enum import Enum
+from enum import IntEnum
 from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
 
-class KeyState(Enum):
-    PROVISIONED = "provisioned"
-    RESERVED = "reserved"
-    USED = "used"
-    CONSUMED = "consumed"
-    EXPIRED = "expired"
-    ZEROIZED = "zeroized"
+class KeyState(IntEnum):
+    PROVISIONED = 0
+    RESERVED = 1
+    USED = 2
+    CONSUMED = 3
+    EXPIRED = 4
+    ZEROIZED = 5
+
+
+# Display names indexed by KeyState value; only used at log/format time.
+_NAMES = ("provisioned", "reserved", "used", "consumed", "expired", "zeroized")
+
+# Transitions are check-then-set, so each one holds a lock. Keys hash onto a
+# fixed set of stripes so transitions on unrelated keys don't serialize; each
+# stripe also keeps its own per-state counts for get_stats.
+_LOCK_STRIPES = 64
 
 
 @dataclass
@@ -32,63 +42,86 @@ class KeyLifecycle:
     
     def __init__(self):
         self._entries: Dict[str, KeyLifecycleEntry] = {}
+        self._locks = tuple(threading.Lock() for _ in range(_LOCK_STRIPES))
+        self._counts = [[0] * len(_NAMES) for _ in range(_LOCK_STRIPES)]
+    
+    def _stripe(self, key_id: str) -> int:
+        return hash(key_id) % _LOCK_STRIPES
+    
+    def _set_state(self, stripe: int, entry: KeyLifecycleEntry, state: KeyState) -> None:
+        counts = self._counts[stripe]
+        counts[entry.state] -= 1
+        counts[state] += 1
+        entry.state = state
     
     def track(self, key_id: str, key_type: str) -> None:
-        self._entries[key_id] = KeyLifecycleEntry(
-            key_id=key_id,
-            key_type=key_type,
-            state=KeyState.PROVISIONED,
-            created_at=datetime.now(timezone.utc),
-        )
+        stripe = self._stripe(key_id)
+        with self._locks[stripe]:
+            previous = self._entries.get(key_id)
+            if previous:
+                self._counts[stripe][previous.state] -= 1
+            self._entries[key_id] = KeyLifecycleEntry(
+                key_id=key_id,
+                key_type=key_type,
+                state=KeyState.PROVISIONED,
+                created_at=datetime.now(timezone.utc),
+            )
+            self._counts[stripe][KeyState.PROVISIONED] += 1
         logger.debug("Key %s: PROVISIONED (%s)", key_id, key_type)
     
     def reserve(self, key_id: str) -> bool:
-        entry = self._entries.get(key_id)
-        if not entry:
-            return False
-        
-        if entry.state not in (KeyState.PROVISIONED,):
-            logger.warning(
-                "Cannot reserve key %s in state %s",
-                key_id, entry.state.value
-            )
-            return False
-        
-        entry.state = KeyState.RESERVED
-        entry.reserved_at = datetime.now(timezone.utc)
-        logger.debug("Key %s: PROVISIONED → RESERVED", key_id)
-        return True
+        stripe = self._stripe(key_id)
+        with self._locks[stripe]:
+            entry = self._entries.get(key_id)
+            if not entry:
+                return False
+            
+            if entry.state not in (KeyState.PROVISIONED,):
+                logger.warning(
+                    "Cannot reserve key %s in state %s",
+                    key_id, _NAMES[entry.state]
+                )
+                return False
+            
+            self._set_state(stripe, entry, KeyState.RESERVED)
+            entry.reserved_at = datetime.now(timezone.utc)
+            logger.debug("Key %s: PROVISIONED → RESERVED", key_id)
+            return True
     
     def mark_used(self, key_id: str) -> bool:
-        entry = self._entries.get(key_id)
-        if not entry:
-            return False
-        
-        if entry.state not in (KeyState.RESERVED, KeyState.PROVISIONED):
-            logger.warning(
-                "Cannot mark key %s used in state %s",
-                key_id, entry.state.value
-            )
-            return False
-        
-        entry.state = KeyState.USED
-        entry.used_at = datetime.now(timezone.utc)
-        logger.debug("Key %s: → USED", key_id)
-        return True
+        stripe = self._stripe(key_id)
+        with self._locks[stripe]:
+            entry = self._entries.get(key_id)
+            if not entry:
+                return False
+            
+            if entry.state not in (KeyState.RESERVED, KeyState.PROVISIONED):
+                logger.warning(
+                    "Cannot mark key %s used in state %s",
+                    key_id, _NAMES[entry.state]
+                )
+                return False
+            
+            self._set_state(stripe, entry, KeyState.USED)
+            entry.used_at = datetime.now(timezone.utc)
+            logger.debug("Key %s: → USED", key_id)
+            return True
     
     def mark_consumed(self, key_id: str) -> bool:
-        entry = self._entries.get(key_id)
-        if not entry:
-            return False
-        
-        if entry.state == KeyState.CONSUMED:
-            logger.warning("Key %s already consumed", key_id)
-            return False
-        
-        entry.state = KeyState.CONSUMED
-        entry.consumed_at = datetime.now(timezone.utc)
-        logger.info("Key %s: → CONSUMED (one-time use complete)", key_id)
-        return True
+        stripe = self._stripe(key_id)
+        with self._locks[stripe]:
+            entry = self._entries.get(key_id)
+            if not entry:
+                return False
+            
+            if entry.state == KeyState.CONSUMED:
+                logger.warning("Key %s already consumed", key_id)
+                return False
+            
+            self._set_state(stripe, entry, KeyState.CONSUMED)
+            entry.consumed_at = datetime.now(timezone.utc)
+            logger.info("Key %s: → CONSUMED (one-time use complete)", key_id)
+            return True
     
     def is_consumable(self, key_id: str) -> bool:
         entry = self._entries.get(key_id)
@@ -104,10 +137,12 @@ class KeyLifecycle:
         return entry.state == KeyState.CONSUMED
     
     def mark_zeroized(self, key_id: str) -> None:
-        entry = self._entries.get(key_id)
-        if entry:
-            entry.state = KeyState.ZEROIZED
-            logger.debug("Key %s: → ZEROIZED", key_id)
+        stripe = self._stripe(key_id)
+        with self._locks[stripe]:
+            entry = self._entries.get(key_id)
+            if entry:
+                self._set_state(stripe, entry, KeyState.ZEROIZED)
+                logger.debug("Key %s: → ZEROIZED", key_id)
     
     def get_state(self, key_id: str) -> Optional[KeyState]:
         entry = self._entries.get(key_id)
@@ -117,13 +152,18 @@ class KeyLifecycle:
         now = datetime.now(timezone.utc)
         expired = []
         
-        for key_id, entry in self._entries.items():
+        # Snapshot: track() may add entries from other threads meanwhile.
+        for key_id, entry in list(self._entries.items()):
             age = (now - entry.created_at).total_seconds()
             if age > max_age_seconds:
                 expired.append(key_id)
         
         for key_id in expired:
-            del self._entries[key_id]
+            stripe = self._stripe(key_id)
+            with self._locks[stripe]:
+                entry = self._entries.pop(key_id, None)
+                if entry:
+                    self._counts[stripe][entry.state] -= 1
         
         if expired:
             logger.info("Cleaned up %d expired key entries", len(expired))
@@ -131,7 +171,5 @@ class KeyLifecycle:
         return len(expired)
     
     def get_stats(self) -> Dict[str, int]:
-        stats = {state.value: 0 for state in KeyState}
-        for entry in self._entries.values():
-            stats[entry.state.value] += 1
-        return stats
+        # Sums the per-stripe counters; no walk over the entries.
+        return dict(zip(_NAMES, map(sum, zip(*self._counts))))
@@ -71,8 +71,7 @@ class MemoryKeyStore:
             return len(self._store)
     
     def _zeroize_entry(self, entry: KeyEntry) -> None:
-        for i in range(len(entry.key_material)):
-            entry.key_material[i] = 0
+        entry.key_material[:] = bytes(len(entry.key_material))
     
     def _evict_oldest(self) -> None:
         if not self._store:
@@ -9,7 +9,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from api import auth, emails, security, accounts, settings, diagnostics
 from api.dependencies import verify_startup_requirements
 from config import settings as config_settings
-from storage.database import init_database
+from qkd_client import close_client
+from storage.database import close_database, init_database
 
 logging.basicConfig(
     level=getattr(logging, config_settings.log_level),
@@ -33,6 +34,8 @@ async def lifespan(app: FastAPI):
     yield
     
     logger.info("Shutting down QuMail Backend")
+    await close_client()
+    await close_database()
 
 
 app = FastAPI(
@@ -1,10 +1,15 @@
-from .validator import validate_send_request, check_recipient_capability
+from .validator import (
+    validate_send_request,
+    check_recipient_capability,
+    invalidate_recipient_cache,
+)
 from .rules import SecurityRules
 from .fallback import get_fallback_level
 
 __all__ = [
     "validate_send_request",
     "check_recipient_capability",
+    "invalidate_recipient_cache",
     "SecurityRules",
     "get_fallback_level",
 ]
@@ -1,9 +1,20 @@
+import functools
 import logging
 from typing import Any, Dict, List
 
 logger = logging.getLogger(__name__)
 
 
+_ALL_LEVELS = frozenset((1, 2, 3, 4))
+
+_FALLBACK_ORDER = {
+    1: (1, 2, 3, 4),
+    2: (2, 3, 4),
+    3: (3, 2, 4),
+    4: (4,),
+}
+
+
 def get_fallback_level(
     requested_level: int,
     recipient_capabilities: List[Dict[str, Any]],
@@ -11,28 +22,25 @@ def get_fallback_level(
     if not recipient_capabilities:
         return requested_level
     
-    common_levels = set([1, 2, 3, 4])
+    common_levels = _ALL_LEVELS
     for cap in recipient_capabilities:
-        supported = set(cap.get("supported_levels", [4]))
-        common_levels &= supported
+        common_levels = common_levels.intersection(cap.get("supported_levels", (4,)))
     
     if not common_levels:
         logger.warning("No common security levels, falling back to plain")
         return 4
     
+    return _fallback_for_common_levels(requested_level, common_levels)
+
+
+@functools.lru_cache(maxsize=64)
+def _fallback_for_common_levels(requested_level: int, common_levels: frozenset) -> int:
     if 4 in common_levels:
-        common_levels.discard(4)
+        common_levels = common_levels - {4}
         if not common_levels:
             return 4
     
-    fallback_order = {
-        1: [1, 2, 3, 4],
-        2: [2, 3, 4],
-        3: [3, 2, 4],
-        4: [4],
-    }
-    
-    order = fallback_order.get(requested_level, [requested_level, 4])
+    order = _FALLBACK_ORDER.get(requested_level, (requested_level, 4))
     
     for level in order:
         if level in common_levels or level == 4:
@@ -1,8 +1,14 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+_ERR_KM_DISCONNECTED = "Key Manager not connected"
+_ERR_NO_RECIPIENT_KEY = "Recipient's public key not available"
 
-@dataclass
+# (requires_km, requires_recipient_key, max_message_size, too_large_error)
+_FastRow = Tuple[bool, bool, Optional[int], Optional[str]]
+
+
+@dataclass(slots=True, frozen=True)
 class LevelRequirements:
     level: int
     name: str
@@ -12,6 +18,22 @@ class LevelRequirements:
     description: str
 
 
+def _build_fast_table(requirements: Dict[int, LevelRequirements]) -> List[Optional[_FastRow]]:
+    """Flatten LEVEL_REQUIREMENTS into a list indexed by level for can_use_level."""
+    table: List[Optional[_FastRow]] = [None] * (max(requirements) + 1)
+    for level, req in requirements.items():
+        too_large = None
+        if req.max_message_size:
+            too_large = f"Message too large for level {level} (max: {req.max_message_size} bytes)"
+        table[level] = (
+            req.requires_km,
+            req.requires_recipient_key,
+            req.max_message_size,
+            too_large,
+        )
+    return table
+
+
 class SecurityRules:
     
     LEVEL_REQUIREMENTS = {
@@ -49,6 +71,17 @@ class SecurityRules:
         ),
     }
     
+    # Hot-path view of LEVEL_REQUIREMENTS; index 0 is unused.
+    _FAST = _build_fast_table(LEVEL_REQUIREMENTS)
+    
+    # Levels offered for each (km_connected, has_recipient_key) combination.
+    _AVAILABLE = {
+        (False, False): (4,),
+        (False, True): (4,),
+        (True, False): (1, 2, 4),
+        (True, True): (1, 2, 3, 4),
+    }
+    
     def __init__(self):
         self.allow_fallback = True
         self.default_level = 2
@@ -64,18 +97,20 @@ class SecurityRules:
         has_recipient_key: bool,
         message_size: int,
     ) -> tuple[bool, Optional[str]]:
-        req = self.get_requirements(level)
-        if not req:
+        row = self._FAST[level] if 0 < level < len(self._FAST) else None
+        if row is None:
             return False, f"Invalid security level: {level}"
         
-        if req.requires_km and not km_connected:
-            return False, "Key Manager not connected"
+        requires_km, requires_recipient_key, max_size, too_large = row
+        
+        if requires_km and not km_connected:
+            return False, _ERR_KM_DISCONNECTED
         
-        if req.requires_recipient_key and not has_recipient_key:
-            return False, "Recipient's public key not available"
+        if requires_recipient_key and not has_recipient_key:
+            return False, _ERR_NO_RECIPIENT_KEY
         
-        if req.max_message_size and message_size > req.max_message_size:
-            return False, f"Message too large for level {level} (max: {req.max_message_size} bytes)"
+        if max_size and message_size > max_size:
+            return False, too_large
         
         return True, None
     
@@ -83,14 +118,5 @@ class SecurityRules:
         self,
         km_connected: bool,
         has_recipient_key: bool,
-    ) -> List[int]:
-        available = [4]
-        
-        if km_connected:
-            available.append(2)
-            available.append(1)
-            
-            if has_recipient_key:
-                available.append(3)
-        
-        return sorted(available)
+    ) -> Tuple[int, ...]:
+        return self._AVAILABLE[(bool(km_connected), bool(has_recipient_key))]
@@ -1,7 +1,11 @@
+import asyncio
 import logging
-from typing import Any, Dict, List
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
 
 from config import settings
+from storage.database import register_recipient_update_hook
 from .rules import SecurityRules
 from .fallback import get_fallback_level
 
@@ -9,6 +13,29 @@ logger = logging.getLogger(__name__)
 
 _rules = SecurityRules()
 
+# Bound on concurrent recipient lookups so a large To/Cc list
+# does not flood the database connection.
+_RECIPIENT_LOOKUP_CONCURRENCY = 16
+
+# Recipient capabilities change rarely; cache lookups briefly so repeat
+# recipients do not cost a database round-trip on every send.
+_RECIPIENT_TTL = 60.0
+_RECIPIENT_CACHE_MAX = 1024
+
+_ALL_LEVELS = frozenset((1, 2, 3, 4))
+_KNOWN_RECIPIENT_LEVELS = frozenset((2, 3, 4))
+_ONLY_L4 = frozenset((4,))
+
+_OTP_MAX_SIZE = _rules.get_requirements(1).max_message_size
+_ERR_OTP_TOO_LARGE = f"Message too large for level 1 (max: {_OTP_MAX_SIZE} bytes)"
+
+_ERR_KM_DISCONNECTED = (
+    "Key Manager is not connected. Cannot send encrypted email. "
+    "Please restart the application or try again."
+)
+# LRU of recent lookups; callers get copies so no one can edit a cached entry.
+_recipient_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
 
 async def validate_send_request(
     recipients: List[str],
@@ -16,9 +43,6 @@ async def validate_send_request(
     body_size: int,
     attachment_sizes: List[int] = None,
 ) -> Dict[str, Any]:
-    attachment_sizes = attachment_sizes or []
-    total_size = body_size + sum(attachment_sizes)
-    
     if security_level < 1 or security_level > 4:
         return {
             "valid": False,
@@ -28,17 +52,45 @@ async def validate_send_request(
     if security_level == 4:
         return {"valid": True, "adjusted_level": 4}
     
-    recipient_caps = []
-    for recipient in recipients:
-        cap = await check_recipient_capability(recipient)
-        recipient_caps.append(cap)
+    if security_level == 1:
+        # Only OTP consumes key material proportional to the message size;
+        # stop summing as soon as the level-1 cap is exceeded.
+        total_size = body_size
+        if total_size <= _OTP_MAX_SIZE:
+            for size in attachment_sizes or ():
+                total_size += size
+                if total_size > _OTP_MAX_SIZE:
+                    break
+        if total_size > _OTP_MAX_SIZE:
+            return {"valid": False, "error": _ERR_OTP_TOO_LARGE}
+    
+    from qkd_client import get_key_status
+    
+    # Levels 1-3 all depend on the KM; start the status fetch now so its
+    # round-trip overlaps the recipient lookups.
+    status_task = asyncio.create_task(get_key_status())
+    
+    lookup_slots = asyncio.Semaphore(_RECIPIENT_LOOKUP_CONCURRENCY)
+    
+    async def _bounded_check(recipient: str) -> Dict[str, Any]:
+        async with lookup_slots:
+            return await check_recipient_capability(recipient)
+    
+    try:
+        recipient_caps = await asyncio.gather(
+            *(_bounded_check(r) for r in recipients)
+        )
+    except BaseException:
+        status_task.cancel()
+        raise
     
     unsupported = [
         r["email"] for r in recipient_caps
-        if security_level not in r.get("supported_levels", [4])
+        if security_level not in r.get("supported_levels", _ONLY_L4)
     ]
     
     if unsupported and security_level < 4:
+        status_task.cancel()
         fallback = get_fallback_level(security_level, recipient_caps)
         
         if fallback == security_level:
@@ -58,10 +110,9 @@ async def validate_send_request(
             "warnings": [f"Downgraded to level {fallback} for compatibility"],
         }
     
+    status = await status_task
+    
     if security_level == 1:
-        from qkd_client import get_key_status
-        
-        status = await get_key_status()
         available_otp = status.get("available", {}).get("otp_bytes", 0)
         
         if available_otp < total_size:
@@ -75,14 +126,11 @@ async def validate_send_request(
             }
     
     if security_level in (2, 3):
-        from qkd_client import get_key_status
-        
-        status = await get_key_status()
         if not status.get("connected"):
             logger.warning("Key Manager not connected, blocking encrypted send")
             return {
                 "valid": False,
-                "error": "Key Manager is not connected. Cannot send encrypted email. Please restart the application or try again.",
+                "error": _ERR_KM_DISCONNECTED,
             }
     
     return {
@@ -94,18 +142,44 @@ async def validate_send_request(
 async def check_recipient_capability(email: str) -> Dict[str, Any]:
     from storage.database import get_known_recipient
     
+    now = time.monotonic()
+    entry = _recipient_cache.get(email)
+    if entry and now - entry[0] < _RECIPIENT_TTL:
+        _recipient_cache.move_to_end(email)
+        return dict(entry[1])
+    
     recipient = await get_known_recipient(email)
     
     if recipient:
-        return {
+        result = {
             "email": email,
             "is_qumail_user": True,
-            "supported_levels": recipient.get("supported_levels", [2, 3, 4]),
+            "supported_levels": frozenset(
+                recipient.get("supported_levels", _KNOWN_RECIPIENT_LEVELS)
+            ),
             "public_key": recipient.get("public_key"),
         }
+    else:
+        result = {
+            "email": email,
+            "is_qumail_user": False,
+            "supported_levels": _ALL_LEVELS,
+        }
     
-    return {
-        "email": email,
-        "is_qumail_user": False,
-        "supported_levels": [1, 2, 3, 4],
-    }
+    _recipient_cache[email] = (now, result)
+    _recipient_cache.move_to_end(email)
+    if len(_recipient_cache) > _RECIPIENT_CACHE_MAX:
+        _recipient_cache.popitem(last=False)
+    return dict(result)
+
+
+def invalidate_recipient_cache(email: str = None) -> None:
+    """Drop cached capabilities for one recipient, or all when email is None."""
+    if email is None:
+        _recipient_cache.clear()
+    else:
+        _recipient_cache.pop(email, None)
+
+
+# Stored recipients change their capabilities; drop the stale entry on write.
+register_recipient_update_hook(invalidate_recipient_cache)
@@ -1,17 +1,37 @@
 from .client import (
     request_key,
+    request_keys_batch,
     get_key,
     consume_key,
     get_key_status,
     request_key_refresh,
+    close_client,
     KeyRequestError,
 )
+from .exceptions import (
+    KeyNotFoundError,
+    KeyExhaustedError,
+    KeyManagerUnavailableError,
+    KM_ERROR,
+    KEY_NOT_FOUND,
+    KEY_EXHAUSTED,
+    KM_UNAVAILABLE,
+)
 
 __all__ = [
     "request_key",
+    "request_keys_batch",
     "get_key",
     "consume_key",
     "get_key_status",
     "request_key_refresh",
+    "close_client",
     "KeyRequestError",
+    "KeyNotFoundError",
+    "KeyExhaustedError",
+    "KeyManagerUnavailableError",
+    "KM_ERROR",
+    "KEY_NOT_FOUND",
+    "KEY_EXHAUSTED",
+    "KM_UNAVAILABLE",
 ]
@@ -1,29 +1,153 @@
-import base64
+import asyncio
 import logging
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 
+# pybase64 (optional) decodes with SIMD; output is identical.
+try:
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
+
 from config import settings
+from utils import json_codec
 from .models import KeyResponse, KeyStatusResponse
-from .exceptions import KeyRequestError, KeyNotFoundError, KeyExhaustedError
+from .exceptions import (
+    KeyRequestError,
+    KeyNotFoundError,
+    KeyExhaustedError,
+    KeyManagerUnavailableError,
+)
 
 logger = logging.getLogger(__name__)
 
 _last_sync: Optional[datetime] = None
 
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+_STATUS_TIMEOUT = 10.0
+_UDS_SCHEME = "unix://"
+
+# Pool-wide status is polled several times per send; a short-lived cache keeps
+# those polls from each costing a KM round-trip. Key requests and consumption
+# invalidate it so OTP byte counts never go stale across a send.
+_STATUS_TTL = 0.5
+_status_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+# Ask the KM for raw key bytes; it falls back to JSON + base64 if unsupported.
+_RAW_KEY_MEDIA_TYPE = "application/octet-stream"
+_KEY_HEADERS = {"Accept": f"{_RAW_KEY_MEDIA_TYPE}, application/json;q=0.9"}
+
+
+def _parse_key_response(response: httpx.Response) -> Tuple[Dict[str, Any], bytes]:
+    """Split a KM key response into (metadata, key_material)."""
+    if response.headers.get("content-type", "").startswith(_RAW_KEY_MEDIA_TYPE):
+        headers = response.headers
+        data = {
+            "key_id": headers["x-key-id"],
+            "peer_id": headers.get("x-key-peer-id", ""),
+            "key_type": headers.get("x-key-type", "aes_seed"),
+        }
+        if "x-key-created-at" in headers:
+            data["created_at"] = headers["x-key-created-at"]
+        return data, response.content
+    
+    data = json_codec.loads(response.content)
+    return data, b64decode(data["key_material"])
+
+
+# Per-operation mapping of KM status codes to (exception, message template);
+# any other non-200 status raises a plain KeyRequestError.
+_ErrorTable = Dict[int, Tuple[type, str]]
+
+_REQUEST_ERRORS: _ErrorTable = {
+    503: (KeyExhaustedError, "Insufficient key material for {subject}"),
+}
+_GET_ERRORS: _ErrorTable = {
+    404: (KeyNotFoundError, "Key {subject} not found"),
+    410: (KeyExhaustedError, "Key {subject} already consumed"),
+}
+_CONSUME_ERRORS: _ErrorTable = {
+    410: (KeyExhaustedError, "Key {subject} already consumed"),
+}
+_NO_MAPPED_ERRORS: _ErrorTable = {}
+
+
+def _raise_for_status(
+    response: httpx.Response,
+    errors: _ErrorTable,
+    subject: str,
+    failure: str,
+) -> None:
+    status_code = response.status_code
+    if status_code == 200:
+        return
+    
+    mapped = errors.get(status_code)
+    if mapped is not None:
+        exc_type, template = mapped
+        raise exc_type(template.format(subject=subject))
+    
+    logger.error("%s with status %d", failure, status_code)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s, response body: %s", failure, response.text)
+    raise KeyRequestError(f"{failure}: {status_code}")
+
+
+def _invalidate_status_cache() -> None:
+    global _status_cache
+    _status_cache = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared KM client, creating it on first use.
+    
+    Idle connections expire after 60s so a restarted Key Manager is not hit
+    through a stale socket, and the transport retries failed connects twice.
+    A ``unix:///path/to/km.sock`` KM URL talks to a co-located Key Manager over
+    a UNIX domain socket instead of loopback TCP.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        base_url = settings.km_url
+        socket_kwargs = {}
+        if base_url.startswith(_UDS_SCHEME):
+            socket_kwargs["uds"] = base_url[len(_UDS_SCHEME):]
+            base_url = "http://localhost"
+        
+        _client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=60.0,
+            headers={
+                "Authorization": f"Bearer {settings.km_token}",
+                "Content-Type": "application/json",
+            },
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                limits=httpx.Limits(
+                    max_keepalive_connections=32,
+                    max_connections=64,
+                    keepalive_expiry=60.0,
+                ),
+                **socket_kwargs,
+            ),
+        )
+        _client_loop = loop
+    return _client
+
 
-def _make_client(timeout: float = 60.0) -> httpx.AsyncClient:
-    """Create a fresh httpx client for each request to avoid stale connections."""
-    return httpx.AsyncClient(
-        base_url=settings.km_url,
-        timeout=timeout,
-        headers={
-            "Authorization": f"Bearer {settings.km_token}",
-            "Content-Type": "application/json",
-        },
-    )
+async def close_client() -> None:
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
 
 
 async def request_key(
@@ -34,129 +158,179 @@ async def request_key(
     global _last_sync
     
     try:
-        async with _make_client() as client:
-            response = await client.post(
-                "/api/v1/keys/request",
-                json={
-                    "peer_id": peer_id,
-                    "size": size,
-                    "key_type": key_type,
-                },
-            )
-            
-            if response.status_code == 503:
-                raise KeyExhaustedError(f"Insufficient key material for {key_type}")
-            
-            if response.status_code != 200:
-                logger.error("Key request failed: %s", response.text)
-                raise KeyRequestError(f"Key request failed: {response.status_code}")
-            
-            data = response.json()
-            _last_sync = datetime.now(timezone.utc)
-            
-            key_material = base64.b64decode(data["key_material"])
-            
-            logger.info(
-                "Received key %s for peer %s, size=%d bytes",
-                data["key_id"], peer_id, len(key_material)
+        client = _get_client()
+        response = await client.post(
+            "/api/v1/keys/request",
+            content=json_codec.dumps({
+                "peer_id": peer_id,
+                "size": size,
+                "key_type": key_type,
+            }),
+            headers=_KEY_HEADERS,
+        )
+        
+        _raise_for_status(response, _REQUEST_ERRORS, key_type, "Key request failed")
+        
+        data, key_material = _parse_key_response(response)
+        now = datetime.now(timezone.utc)
+        _last_sync = now
+        _invalidate_status_cache()
+        created_str = data.get("created_at")
+        
+        logger.info(
+            "Received key %s for peer %s, size=%d bytes",
+            data["key_id"], peer_id, len(key_material)
+        )
+        
+        return KeyResponse(
+            key_id=data["key_id"],
+            key_material=key_material,
+            peer_id=peer_id,
+            key_type=key_type,
+            created_at=datetime.fromisoformat(created_str) if created_str else now,
+        )
+        
+    except httpx.ConnectError as e:
+        logger.error("Cannot connect to Key Manager: %s", e)
+        raise KeyManagerUnavailableError("Key Manager not reachable")
+    except httpx.TimeoutException:
+        logger.error("Key Manager request timed out (key generation took too long)")
+        raise KeyManagerUnavailableError("Key Manager request timed out")
+
+
+async def request_keys_batch(
+    requests: List[Tuple[str, int, str]],
+) -> List[KeyResponse]:
+    """Request one key per (peer_id, size, key_type) in a single KM round-trip.
+    
+    Keys are returned in the same order as the requests.
+    """
+    global _last_sync
+    
+    try:
+        client = _get_client()
+        response = await client.post(
+            "/api/v1/keys/request:batch",
+            content=json_codec.dumps([
+                {"peer_id": peer_id, "size": size, "key_type": key_type}
+                for peer_id, size, key_type in requests
+            ]),
+        )
+        
+        _raise_for_status(response, _REQUEST_ERRORS, "batch request", "Batch key request failed")
+        
+        items = json_codec.loads(response.content)
+        if len(items) != len(requests):
+            raise KeyRequestError(
+                f"Batch key request returned {len(items)} keys for {len(requests)} requests"
             )
-            
-            return KeyResponse(
-                key_id=data["key_id"],
-                key_material=key_material,
+        
+        now = datetime.now(timezone.utc)
+        _last_sync = now
+        _invalidate_status_cache()
+        
+        logger.info("Received %d keys in batch", len(items))
+        
+        return [
+            KeyResponse(
+                key_id=item["key_id"],
+                key_material=b64decode(item["key_material"]),
                 peer_id=peer_id,
                 key_type=key_type,
-                created_at=datetime.fromisoformat(data.get("created_at", datetime.now(timezone.utc).isoformat())),
+                created_at=datetime.fromisoformat(item["created_at"]) if item.get("created_at") else now,
             )
+            for item, (peer_id, _, key_type) in zip(items, requests)
+        ]
         
     except httpx.ConnectError as e:
         logger.error("Cannot connect to Key Manager: %s", e)
-        raise KeyRequestError("Key Manager not reachable")
+        raise KeyManagerUnavailableError("Key Manager not reachable")
     except httpx.TimeoutException:
-        logger.error("Key Manager request timed out (key generation took too long)")
-        raise KeyRequestError("Key Manager request timed out")
+        logger.error("Key Manager batch request timed out")
+        raise KeyManagerUnavailableError("Key Manager request timed out")
 
 
 async def get_key(key_id: str) -> KeyResponse:
     try:
-        async with _make_client() as client:
-            response = await client.get(f"/api/v1/keys/{key_id}")
-            
-            if response.status_code == 404:
-                raise KeyNotFoundError(f"Key {key_id} not found")
-            
-            if response.status_code == 410:
-                raise KeyExhaustedError(f"Key {key_id} already consumed")
-            
-            if response.status_code != 200:
-                raise KeyRequestError(f"Get key failed: {response.status_code}")
-            
-            data = response.json()
-            key_material = base64.b64decode(data["key_material"])
-            
-            return KeyResponse(
-                key_id=data["key_id"],
-                key_material=key_material,
-                peer_id=data.get("peer_id", ""),
-                key_type=data.get("key_type", "aes_seed"),
-                used=data.get("used", False),
-            )
+        client = _get_client()
+        response = await client.get(f"/api/v1/keys/{key_id}", headers=_KEY_HEADERS)
+        
+        _raise_for_status(response, _GET_ERRORS, key_id, "Get key failed")
+        
+        data, key_material = _parse_key_response(response)
+        
+        return KeyResponse(
+            key_id=data["key_id"],
+            key_material=key_material,
+            peer_id=data.get("peer_id", ""),
+            key_type=data.get("key_type", "aes_seed"),
+            used=data.get("used", False),
+        )
         
     except httpx.ConnectError as e:
         logger.error("Cannot connect to Key Manager: %s", e)
-        raise KeyRequestError("Key Manager not reachable")
+        raise KeyManagerUnavailableError("Key Manager not reachable")
     except httpx.TimeoutException:
         logger.error("Key Manager timed out fetching key")
-        raise KeyRequestError("Key Manager request timed out")
+        raise KeyManagerUnavailableError("Key Manager request timed out")
 
 
 async def consume_key(key_id: str) -> bool:
     try:
-        async with _make_client() as client:
-            response = await client.post(f"/api/v1/keys/{key_id}/consume")
-            
-            if response.status_code == 410:
-                raise KeyExhaustedError(f"Key {key_id} already consumed")
-            
-            if response.status_code != 200:
-                raise KeyRequestError(f"Consume key failed: {response.status_code}")
-            
-            logger.info("Key %s marked as consumed", key_id)
-            return True
+        client = _get_client()
+        response = await client.post(f"/api/v1/keys/{key_id}/consume")
+        
+        _raise_for_status(response, _CONSUME_ERRORS, key_id, "Consume key failed")
+        
+        _invalidate_status_cache()
+        logger.info("Key %s marked as consumed", key_id)
+        return True
         
     except httpx.ConnectError:
-        raise KeyRequestError("Key Manager not reachable")
+        raise KeyManagerUnavailableError("Key Manager not reachable")
     except httpx.TimeoutException:
         logger.error("Key Manager timed out consuming key")
-        raise KeyRequestError("Key Manager request timed out")
+        raise KeyManagerUnavailableError("Key Manager request timed out")
 
 
 async def get_key_status(peer_id: Optional[str] = None) -> Dict[str, Any]:
+    global _status_cache
+    
+    if peer_id is None and _status_cache is not None:
+        cached_at, cached = _status_cache
+        if time.monotonic() - cached_at < _STATUS_TTL:
+            return cached
+    
     # Use a medium timeout for status polls so they don't timeout under load but don't hang forever.
     try:
-        async with _make_client(timeout=10.0) as client:
-            params = {"peer_id": peer_id} if peer_id else {}
-            response = await client.get("/api/v1/keys/status", params=params)
-            
-            if response.status_code != 200:
-                return {
-                    "connected": False,
-                    "available": {"otp_bytes": 0, "aes_keys": 0, "pqc_keys": 0},
-                    "error": f"Status check failed: {response.status_code}",
-                }
-            
-            data = response.json()
-            
+        client = _get_client()
+        params = {"peer_id": peer_id} if peer_id else {}
+        response = await client.get(
+            "/api/v1/keys/status", params=params, timeout=_STATUS_TIMEOUT
+        )
+        
+        if response.status_code != 200:
             return {
-                "connected": True,
-                "available": {
-                    "otp_bytes": data.get("otp_bytes_available", 0),
-                    "aes_keys": data.get("aes_keys_available", 0),
-                    "pqc_keys": data.get("pqc_keys_available", 0),
-                },
-                "last_sync": _last_sync,
+                "connected": False,
+                "available": {"otp_bytes": 0, "aes_keys": 0, "pqc_keys": 0},
+                "error": f"Status check failed: {response.status_code}",
             }
         
+        data = json_codec.loads(response.content)
+        
+        status = {
+            "connected": True,
+            "available": {
+                "otp_bytes": data.get("otp_bytes_available", 0),
+                "aes_keys": data.get("aes_keys_available", 0),
+                "pqc_keys": data.get("pqc_keys_available", 0),
+            },
+            "last_sync": _last_sync,
+        }
+        if peer_id is None:
+            _status_cache = (time.monotonic(), status)
+        return status
+        
     except httpx.ConnectError:
         return {
             "connected": False,
@@ -183,20 +357,20 @@ async def get_key_status(peer_id: Optional[str] = None) -> Dict[str, Any]:
 
 async def request_key_refresh(key_type: str, size: int) -> Dict[str, Any]:
     try:
-        async with _make_client() as client:
-            response = await client.post(
-                "/api/v1/keys/provision",
-                json={
-                    "key_type": key_type,
-                    "size": size,
-                },
-            )
-            
-            if response.status_code != 200:
-                raise KeyRequestError(f"Key refresh failed: {response.status_code}")
-            
-            data = response.json()
-            return {"keys_added": data.get("keys_added", 0)}
+        client = _get_client()
+        response = await client.post(
+            "/api/v1/keys/provision",
+            content=json_codec.dumps({
+                "key_type": key_type,
+                "size": size,
+            }),
+        )
+        
+        _raise_for_status(response, _NO_MAPPED_ERRORS, key_type, "Key refresh failed")
+        
+        _invalidate_status_cache()
+        data = json_codec.loads(response.content)
+        return {"keys_added": data.get("keys_added", 0)}
         
     except httpx.ConnectError:
-        raise KeyRequestError("Key Manager not reachable")
+        raise KeyManagerUnavailableError("Key Manager not reachable")
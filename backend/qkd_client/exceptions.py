@@ -1,14 +1,26 @@
+# Integer failure codes, so callers can branch on ``exc.code`` instead of
+# walking the subclass hierarchy with isinstance checks.
+KM_ERROR = 0
+KEY_NOT_FOUND = 1
+KEY_EXHAUSTED = 2
+KM_UNAVAILABLE = 3
+
+
 class KeyRequestError(Exception):
-    pass
+    __slots__ = ()
+    code = KM_ERROR
 
 
 class KeyNotFoundError(KeyRequestError):
-    pass
+    __slots__ = ()
+    code = KEY_NOT_FOUND
 
 
 class KeyExhaustedError(KeyRequestError):
-    pass
+    __slots__ = ()
+    code = KEY_EXHAUSTED
 
 
 class KeyManagerUnavailableError(KeyRequestError):
-    pass
+    __slots__ = ()
+    code = KM_UNAVAILABLE
@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class KeyResponse:
     key_id: str
     key_material: bytes
@@ -14,7 +14,7 @@ class KeyResponse:
     used: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class KeyStatusResponse:
     connected: bool
     otp_bytes_available: int
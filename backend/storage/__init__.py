@@ -1,21 +1,33 @@
 from .database import (
+    EmailDraft,
+    OAuthTokens,
+    SentEmail,
     init_database,
     store_oauth_tokens,
     get_oauth_tokens,
     get_stored_accounts,
     get_known_recipient,
     store_known_recipient,
+    register_recipient_update_hook,
     save_email_draft,
+    save_email_drafts,
     save_sent_email,
+    save_sent_emails,
 )
 
 __all__ = [
+    "EmailDraft",
+    "OAuthTokens",
+    "SentEmail",
     "init_database",
     "store_oauth_tokens",
     "get_oauth_tokens",
     "get_stored_accounts",
     "get_known_recipient",
     "store_known_recipient",
+    "register_recipient_update_hook",
     "save_email_draft",
+    "save_email_drafts",
     "save_sent_email",
+    "save_sent_emails",
 ]
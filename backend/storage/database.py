@@ -1,107 +1,290 @@
-import json
+import asyncio
 import logging
-from datetime import datetime, timezone, timedelta
+import time
+from hashlib import sha256
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
 
 import aiosqlite
 
 from config import settings
+from utils import json_codec
 
 logger = logging.getLogger(__name__)
 
 _db_connection: Optional[aiosqlite.Connection] = None
 
 
+class OAuthTokens(NamedTuple):
+    email: str
+    access_token: str
+    refresh_token: Optional[str]
+    expires_at: Optional[int]
+
+
+class EmailDraft(NamedTuple):
+    draft_id: str
+    to: List[str]
+    cc: List[str]
+    subject: str
+    body: str
+    security_level: int
+
+
+class SentEmail(NamedTuple):
+    message_id: str
+    from_addr: str
+    to_addrs: List[str]
+    cc_addrs: List[str]
+    subject: str
+    body: str
+    security_level: int
+    key_id: Optional[str]
+
+
+# Audit events arrive in bursts during a send. They are queued and written by a
+# background flusher that collects up to _AUDIT_MAX_BATCH rows (or waits at
+# most _AUDIT_FLUSH_INTERVAL seconds) per executemany + commit.
+_AUDIT_FLUSH_INTERVAL = 0.05
+_AUDIT_MAX_BATCH = 256
+
+_audit_queue: Optional[asyncio.Queue] = None
+_audit_flusher_task: Optional[asyncio.Task] = None
+
+# Settings change rarely; get_settings serves them from memory after the first
+# read and save_setting keeps the cache in step with the table.
+_settings_cache: Optional[Dict[str, Any]] = None
+_settings_lock: Optional[asyncio.Lock] = None
+
+# Every coroutine shares one connection, so any commit() also commits whatever
+# another coroutine has executed so far. Writers hold this lock from their
+# first statement through commit, so multi-statement writes commit whole.
+_write_lock: Optional[asyncio.Lock] = None
+
+# Called with the email after store_known_recipient commits, so layers that
+# cache recipient data (the policy validator) can drop stale entries.
+_recipient_update_hooks: List[Callable[[str], None]] = []
+
+_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS accounts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT UNIQUE NOT NULL,
+        provider TEXT DEFAULT 'gmail',
+        access_token TEXT,
+        refresh_token TEXT,
+        expires_at INTEGER,
+        connected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS known_recipients (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT UNIQUE NOT NULL,
+        is_qumail_user BOOLEAN DEFAULT 0,
+        public_key TEXT,
+        public_key_fingerprint TEXT,
+        supported_levels TEXT DEFAULT '[4]',
+        last_seen TIMESTAMP,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- One row per supported level, so get_known_recipient reads typed
+    -- integers off the primary key instead of decoding the JSON column.
+    CREATE TABLE IF NOT EXISTS known_recipient_levels (
+        email TEXT NOT NULL REFERENCES known_recipients(email) ON DELETE CASCADE,
+        level INTEGER NOT NULL,
+        PRIMARY KEY (email, level)
+    ) WITHOUT ROWID;
+
+    -- Backfill from the JSON column for any recipient without level rows:
+    -- rows written before the side table existed, or since by an older build.
+    INSERT OR IGNORE INTO known_recipient_levels (email, level)
+        SELECT email, value FROM known_recipients, json_each(known_recipients.supported_levels)
+        WHERE known_recipients.email NOT IN (SELECT email FROM known_recipient_levels);
+
+    CREATE TABLE IF NOT EXISTS drafts (
+        id TEXT PRIMARY KEY,
+        to_addrs TEXT,
+        cc_addrs TEXT,
+        subject TEXT,
+        body TEXT,
+        security_level INTEGER DEFAULT 2,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS sent_emails (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        message_id TEXT UNIQUE,
+        from_addr TEXT,
+        to_addrs TEXT,
+        cc_addrs TEXT,
+        subject TEXT,
+        body_hash TEXT,
+        security_level INTEGER,
+        key_id TEXT,
+        sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS audit_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_type TEXT NOT NULL,
+        event_data TEXT,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS settings (
+        key TEXT PRIMARY KEY,
+        value TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS oauth_states (
+        state TEXT PRIMARY KEY,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Covering index for the token lookup: the projected columns are served
+    -- from the index without a second probe into the table. The planner
+    -- prefers the UNIQUE autoindex on email, so get_oauth_tokens names it
+    -- with INDEXED BY.
+    CREATE INDEX IF NOT EXISTS idx_accounts_email_tokens
+        ON accounts(email, access_token, refresh_token, expires_at);
+
+    -- known_recipients is read through its UNIQUE email autoindex; a covering
+    -- index would copy the multi-KB public keys into a second B-tree.
+    DROP INDEX IF EXISTS idx_known_recip;
+"""
+
+# Serialized forms of the values written on nearly every call, so the common
+# case skips the encoder entirely.
+_DEFAULT_LEVELS = (4,)
+_DEFAULT_LEVELS_JSON = "[4]"
+_EMPTY_LIST_JSON = "[]"
+
+# sqlite3 keeps prepared statements in a per-connection LRU keyed by SQL text,
+# so the hot-path statements live in module constants: every call passes the
+# identical string and reuses the compiled statement instead of re-planning.
+_STATEMENT_CACHE_SIZE = 256
+
+# foreign_keys is per connection and off by default; the ON DELETE CASCADE on
+# known_recipient_levels depends on it, so every connection gets it.
+_FOREIGN_KEYS_PRAGMA = "PRAGMA foreign_keys=ON"
+
+# Applied once per new file-backed connection in a single executescript round
+# trip. WAL + synchronous=NORMAL drops the per-commit journal fsync that
+# dominates the small audit/sent-email inserts; the larger page cache and mmap
+# keep the btrees hot.
+_CONNECT_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+    PRAGMA mmap_size=268435456;
+"""
+
+_UPSERT_OAUTH_TOKENS_SQL = """
+    INSERT INTO accounts (email, provider, access_token, refresh_token, expires_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(email) DO UPDATE SET
+        provider = excluded.provider,
+        access_token = excluded.access_token,
+        refresh_token = COALESCE(excluded.refresh_token, accounts.refresh_token),
+        expires_at = excluded.expires_at
+"""
+
+_UPSERT_KNOWN_RECIPIENT_SQL = """
+    INSERT INTO known_recipients (email, is_qumail_user, public_key, public_key_fingerprint, supported_levels, last_seen)
+    VALUES (?, 1, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(email) DO UPDATE SET
+        is_qumail_user = 1,
+        public_key = COALESCE(excluded.public_key, known_recipients.public_key),
+        public_key_fingerprint = COALESCE(excluded.public_key_fingerprint, known_recipients.public_key_fingerprint),
+        supported_levels = excluded.supported_levels,
+        last_seen = CURRENT_TIMESTAMP
+"""
+
+_SELECT_RECIPIENT_LEVELS_SQL = "SELECT level FROM known_recipient_levels WHERE email = ?"
+
+_DELETE_RECIPIENT_LEVELS_SQL = "DELETE FROM known_recipient_levels WHERE email = ?"
+
+_INSERT_RECIPIENT_LEVEL_SQL = "INSERT OR IGNORE INTO known_recipient_levels (email, level) VALUES (?, ?)"
+
+_UPSERT_DRAFT_SQL = """
+    INSERT INTO drafts (id, to_addrs, cc_addrs, subject, body, security_level)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        to_addrs = excluded.to_addrs,
+        cc_addrs = excluded.cc_addrs,
+        subject = excluded.subject,
+        body = excluded.body,
+        security_level = excluded.security_level,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+_INSERT_SENT_EMAIL_SQL = """
+    INSERT INTO sent_emails (message_id, from_addr, to_addrs, cc_addrs, subject, body_hash, security_level, key_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_AUDIT_EVENT_SQL = "INSERT INTO audit_log (event_type, event_data) VALUES (?, ?)"
+
+_UPSERT_SETTING_SQL = """
+    INSERT INTO settings (key, value, updated_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(key) DO UPDATE SET
+        value = excluded.value,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
 async def get_db() -> aiosqlite.Connection:
     global _db_connection
     if _db_connection is None:
-        _db_connection = await aiosqlite.connect(settings.db_path)
+        if settings.db_uri:
+            _db_connection = await aiosqlite.connect(
+                settings.db_uri, uri=True, cached_statements=_STATEMENT_CACHE_SIZE
+            )
+        else:
+            _db_connection = await aiosqlite.connect(
+                settings.db_path, cached_statements=_STATEMENT_CACHE_SIZE
+            )
         _db_connection.row_factory = aiosqlite.Row
+        
+        await _db_connection.execute(_FOREIGN_KEYS_PRAGMA)
+        # The journal, sync and cache pragmas don't apply to an in-memory database.
+        if "mode=memory" not in (settings.db_uri or ""):
+            await _db_connection.executescript(_CONNECT_PRAGMAS)
     return _db_connection
 
 
-async def init_database() -> None:
-    db = await get_db()
-    
-    await db.execute("""
-        CREATE TABLE IF NOT EXISTS accounts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            provider TEXT DEFAULT 'gmail',
-            access_token TEXT,
-            refresh_token TEXT,
-            expires_at TIMESTAMP,
-            connected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    await db.execute("""
-        CREATE TABLE IF NOT EXISTS known_recipients (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            is_qumail_user BOOLEAN DEFAULT 0,
-            public_key TEXT,
-            public_key_fingerprint TEXT,
-            supported_levels TEXT DEFAULT '[4]',
-            last_seen TIMESTAMP,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+async def close_database() -> None:
+    """Flush pending audit events, stop the flusher and close the connection."""
+    global _db_connection, _audit_queue, _audit_flusher_task
+    global _settings_cache, _settings_lock, _write_lock
     
-    await db.execute("""
-        CREATE TABLE IF NOT EXISTS drafts (
-            id TEXT PRIMARY KEY,
-            to_addrs TEXT,
-            cc_addrs TEXT,
-            subject TEXT,
-            body TEXT,
-            security_level INTEGER DEFAULT 2,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    await db.execute("""
-        CREATE TABLE IF NOT EXISTS sent_emails (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            message_id TEXT UNIQUE,
-            from_addr TEXT,
-            to_addrs TEXT,
-            cc_addrs TEXT,
-            subject TEXT,
-            body_hash TEXT,
-            security_level INTEGER,
-            key_id TEXT,
-            sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    await db.execute("""
-        CREATE TABLE IF NOT EXISTS audit_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            event_type TEXT NOT NULL,
-            event_data TEXT,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    await db.execute("""
-        CREATE TABLE IF NOT EXISTS settings (
-            key TEXT PRIMARY KEY,
-            value TEXT,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    await flush_audit_log()
+    if _audit_flusher_task is not None:
+        _audit_flusher_task.cancel()
+        try:
+            await _audit_flusher_task
+        except asyncio.CancelledError:
+            pass
+    _audit_flusher_task = None
+    _audit_queue = None
+    _settings_cache = None
+    _settings_lock = None
+    _write_lock = None
     
-    await db.execute("""
-        CREATE TABLE IF NOT EXISTS oauth_states (
-            state TEXT PRIMARY KEY,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
+    if _db_connection is not None:
+        await _db_connection.close()
+        _db_connection = None
+
+
+async def init_database() -> None:
+    db = await get_db()
     
-    await db.commit()
+    await db.executescript(_SCHEMA_SQL)
+    _ensure_audit_flusher()
     logger.info("Database schema initialized")
 
 
@@ -114,76 +297,92 @@ async def store_oauth_tokens(
 ) -> None:
     db = await get_db()
     
-    expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
-    
-    await db.execute("""
-        INSERT INTO accounts (email, provider, access_token, refresh_token, expires_at)
-        VALUES (?, ?, ?, ?, ?)
-        ON CONFLICT(email) DO UPDATE SET
-            provider = excluded.provider,
-            access_token = excluded.access_token,
-            refresh_token = COALESCE(excluded.refresh_token, accounts.refresh_token),
-            expires_at = excluded.expires_at
-    """, (email, provider, access_token, refresh_token, expires_at.isoformat()))
+    # Stored as epoch seconds so expiry checks are a plain integer compare.
+    expires_at = int(time.time()) + expires_in
     
-    await db.commit()
+    async with _get_write_lock():
+        await db.execute(
+            _UPSERT_OAUTH_TOKENS_SQL,
+            (email, provider, access_token, refresh_token, expires_at),
+        )
+        
+        await db.commit()
     logger.info("Stored OAuth tokens for %s (%s)", email, provider)
 
 
-async def get_oauth_tokens(email: str) -> Optional[Dict[str, Any]]:
+async def get_oauth_tokens(email: str) -> Optional[OAuthTokens]:
     db = await get_db()
     
     cursor = await db.execute(
-        "SELECT * FROM accounts WHERE email = ?",
+        """
+        SELECT email, access_token, refresh_token, expires_at
+        FROM accounts INDEXED BY idx_accounts_email_tokens WHERE email = ?
+        """,
         (email,)
     )
+    # Projected lookups unpack positionally, so skip building sqlite3.Row objects.
+    cursor.row_factory = None
     row = await cursor.fetchone()
     
-    if row:
-        return {
-            "email": row["email"],
-            "access_token": row["access_token"],
-            "refresh_token": row["refresh_token"],
-            "expires_at": row["expires_at"],
-        }
-    return None
+    return None if row is None else OAuthTokens._make(row)
 
 
 async def get_stored_accounts() -> List[Dict[str, Any]]:
     db = await get_db()
     
-    cursor = await db.execute("SELECT * FROM accounts")
+    cursor = await db.execute("SELECT email, provider, connected_at FROM accounts")
+    cursor.row_factory = None
     rows = await cursor.fetchall()
     
     return [
         {
-            "email": row["email"],
-            "provider": row["provider"],
-            "connected_at": row["connected_at"],
+            "email": email,
+            "provider": provider,
+            "connected_at": connected_at,
         }
-        for row in rows
+        for email, provider, connected_at in rows
     ]
 
 
 async def get_known_recipient(email: str) -> Optional[Dict[str, Any]]:
     db = await get_db()
     
-    cursor = await db.execute(
-        "SELECT * FROM known_recipients WHERE email = ?",
-        (email,)
-    )
-    row = await cursor.fetchone()
+    # Under the write lock so the read never lands between
+    # store_known_recipient's level DELETE and INSERT.
+    async with _get_write_lock():
+        cursor = await db.execute(
+            """
+            SELECT email, is_qumail_user, public_key, public_key_fingerprint, last_seen
+            FROM known_recipients WHERE email = ?
+            """,
+            (email,)
+        )
+        cursor.row_factory = None
+        row = await cursor.fetchone()
+        
+        if row is None:
+            return None
+        
+        email, is_qumail_user, public_key, fingerprint, last_seen = row
+        
+        cursor = await db.execute(_SELECT_RECIPIENT_LEVELS_SQL, (email,))
+        cursor.row_factory = None
+        levels = [level for (level,) in await cursor.fetchall()]
     
-    if row:
-        return {
-            "email": row["email"],
-            "is_qumail_user": bool(row["is_qumail_user"]),
-            "public_key": row["public_key"],
-            "public_key_fingerprint": row["public_key_fingerprint"],
-            "supported_levels": json.loads(row["supported_levels"]),
-            "last_seen": row["last_seen"],
-        }
-    return None
+    return {
+        "email": email,
+        "is_qumail_user": bool(is_qumail_user),
+        "public_key": public_key,
+        "public_key_fingerprint": fingerprint,
+        "supported_levels": levels or list(_DEFAULT_LEVELS),
+        "last_seen": last_seen,
+    }
+
+
+def register_recipient_update_hook(callback: Callable[[str], None]) -> None:
+    """Call callback(email) after store_known_recipient commits a recipient."""
+    if callback not in _recipient_update_hooks:
+        _recipient_update_hooks.append(callback)
 
 
 async def store_known_recipient(
@@ -193,25 +392,52 @@ async def store_known_recipient(
 ) -> None:
     db = await get_db()
     
-    import hashlib
     fingerprint = None
     if public_key:
-        fingerprint = "SHA256:" + hashlib.sha256(public_key.encode()).hexdigest()[:16]
+        fingerprint = "SHA256:" + sha256(public_key.encode()).hexdigest()[:16]
     
-    levels = json.dumps(supported_levels or [4])
+    levels = json_codec.dumps_str(supported_levels) if supported_levels else _DEFAULT_LEVELS_JSON
     
-    await db.execute("""
-        INSERT INTO known_recipients (email, is_qumail_user, public_key, public_key_fingerprint, supported_levels, last_seen)
-        VALUES (?, 1, ?, ?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(email) DO UPDATE SET
-            is_qumail_user = 1,
-            public_key = COALESCE(excluded.public_key, known_recipients.public_key),
-            public_key_fingerprint = COALESCE(excluded.public_key_fingerprint, known_recipients.public_key_fingerprint),
-            supported_levels = excluded.supported_levels,
-            last_seen = CURRENT_TIMESTAMP
-    """, (email, public_key, fingerprint, levels))
+    # The JSON column is still written so older builds can read the row; the
+    # side table is replaced in the same transaction, which the write lock
+    # keeps other coroutines from committing or reading halfway through.
+    async with _get_write_lock():
+        try:
+            await db.execute(
+                _UPSERT_KNOWN_RECIPIENT_SQL, (email, public_key, fingerprint, levels)
+            )
+            await db.execute(_DELETE_RECIPIENT_LEVELS_SQL, (email,))
+            await db.executemany(
+                _INSERT_RECIPIENT_LEVEL_SQL,
+                [(email, level) for level in (supported_levels or _DEFAULT_LEVELS)],
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
     
-    await db.commit()
+    for hook in _recipient_update_hooks:
+        hook(email)
+
+
+def _list_json(values: List[str]) -> str:
+    return json_codec.dumps_str(values) if values else _EMPTY_LIST_JSON
+
+
+async def save_email_drafts(drafts: List[EmailDraft]) -> None:
+    """Upsert several drafts with one executemany and a single commit."""
+    if not drafts:
+        return
+    
+    db = await get_db()
+    
+    async with _get_write_lock():
+        await db.executemany(_UPSERT_DRAFT_SQL, [
+            (d.draft_id, _list_json(d.to), _list_json(d.cc), d.subject, d.body, d.security_level)
+            for d in drafts
+        ])
+        
+        await db.commit()
 
 
 async def save_email_draft(
@@ -222,21 +448,34 @@ async def save_email_draft(
     body: str,
     security_level: int,
 ) -> None:
+    """Single-draft wrapper around save_email_drafts."""
+    await save_email_drafts([EmailDraft(draft_id, to, cc, subject, body, security_level)])
+
+
+async def save_sent_emails(entries: List[SentEmail]) -> None:
+    """Record several sent emails with one executemany and a single commit."""
+    if not entries:
+        return
+    
     db = await get_db()
     
-    await db.execute("""
-        INSERT INTO drafts (id, to_addrs, cc_addrs, subject, body, security_level)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ON CONFLICT(id) DO UPDATE SET
-            to_addrs = excluded.to_addrs,
-            cc_addrs = excluded.cc_addrs,
-            subject = excluded.subject,
-            body = excluded.body,
-            security_level = excluded.security_level,
-            updated_at = CURRENT_TIMESTAMP
-    """, (draft_id, json.dumps(to), json.dumps(cc), subject, body, security_level))
+    rows = [
+        (
+            e.message_id,
+            e.from_addr,
+            _list_json(e.to_addrs),
+            _list_json(e.cc_addrs),
+            e.subject,
+            sha256(e.body.encode("utf-8", "surrogatepass")).hexdigest(),
+            e.security_level,
+            e.key_id,
+        )
+        for e in entries
+    ]
     
-    await db.commit()
+    async with _get_write_lock():
+        await db.executemany(_INSERT_SENT_EMAIL_SQL, rows)
+        await db.commit()
 
 
 async def save_sent_email(
@@ -249,94 +488,143 @@ async def save_sent_email(
     security_level: int,
     key_id: Optional[str],
 ) -> None:
-    db = await get_db()
-    
-    import hashlib
-    body_hash = hashlib.sha256(body.encode()).hexdigest()
-    
-    await db.execute("""
-        INSERT INTO sent_emails (message_id, from_addr, to_addrs, cc_addrs, subject, body_hash, security_level, key_id)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        message_id,
-        from_addr,
-        json.dumps(to_addrs),
-        json.dumps(cc_addrs),
-        subject,
-        body_hash,
-        security_level,
-        key_id,
-    ))
-    
-    await db.commit()
+    """Single-email wrapper around save_sent_emails."""
+    await save_sent_emails([SentEmail(
+        message_id, from_addr, to_addrs, cc_addrs, subject, body, security_level, key_id
+    )])
+
+
+def _ensure_audit_flusher() -> asyncio.Queue:
+    global _audit_queue, _audit_flusher_task
+    if _audit_flusher_task is None or _audit_flusher_task.done():
+        if _audit_queue is None:
+            _audit_queue = asyncio.Queue()
+        _audit_flusher_task = asyncio.create_task(_audit_flusher(_audit_queue))
+    return _audit_queue
+
+
+async def _audit_flusher(queue: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + _AUDIT_FLUSH_INTERVAL
+        
+        while len(batch) < _AUDIT_MAX_BATCH:
+            try:
+                batch.append(queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        try:
+            db = await get_db()
+            async with _get_write_lock():
+                await db.executemany(_INSERT_AUDIT_EVENT_SQL, batch)
+                await db.commit()
+        except Exception as e:
+            logger.error("Failed to write %d audit events: %s", len(batch), e)
+        finally:
+            for _ in batch:
+                queue.task_done()
 
 
 async def log_audit_event(event_type: str, event_data: Dict[str, Any]) -> None:
-    db = await get_db()
-    
-    await db.execute(
-        "INSERT INTO audit_log (event_type, event_data) VALUES (?, ?)",
-        (event_type, json.dumps(event_data))
-    )
-    
-    await db.commit()
+    """Queue an audit event; it is written by the background flusher."""
+    _ensure_audit_flusher().put_nowait((event_type, json_codec.dumps_str(event_data)))
+
+
+async def flush_audit_log() -> None:
+    """Wait until every queued audit event has been written."""
+    if _audit_queue is not None and _audit_flusher_task is not None:
+        await _audit_queue.join()
+
+
+def _get_write_lock() -> asyncio.Lock:
+    global _write_lock
+    if _write_lock is None:
+        _write_lock = asyncio.Lock()
+    return _write_lock
+
+
+def _get_settings_lock() -> asyncio.Lock:
+    global _settings_lock
+    if _settings_lock is None:
+        _settings_lock = asyncio.Lock()
+    return _settings_lock
 
 
 async def get_settings() -> Dict[str, Any]:
-    db = await get_db()
-    cursor = await db.execute("SELECT key, value FROM settings")
-    rows = await cursor.fetchall()
-    
-    settings_dict = {}
-    for row in rows:
-        try:
-            settings_dict[row["key"]] = json.loads(row["value"])
-        except json.JSONDecodeError:
-            settings_dict[row["key"]] = row["value"]
+    global _settings_cache
+    if _settings_cache is not None:
+        return dict(_settings_cache)
+    
+    async with _get_settings_lock():
+        if _settings_cache is None:
+            db = await get_db()
+            cursor = await db.execute("SELECT key, value FROM settings")
+            rows = await cursor.fetchall()
+            
+            settings_dict = {}
+            for row in rows:
+                try:
+                    settings_dict[row["key"]] = json_codec.loads(row["value"])
+                except json_codec.JSONDecodeError:
+                    settings_dict[row["key"]] = row["value"]
             
-    return settings_dict
+            _settings_cache = settings_dict
+    
+    return dict(_settings_cache)
 
 
 async def save_setting(key: str, value: Any) -> None:
     db = await get_db()
+    encoded = json_codec.dumps_str(value)
     
-    await db.execute("""
-        INSERT INTO settings (key, value, updated_at)
-        VALUES (?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(key) DO UPDATE SET
-            value = excluded.value,
-            updated_at = CURRENT_TIMESTAMP
-    """, (key, json.dumps(value)))
-    
-    await db.commit()
+    async with _get_settings_lock(), _get_write_lock():
+        await db.execute(_UPSERT_SETTING_SQL, (key, encoded))
+        await db.commit()
+        
+        if _settings_cache is not None:
+            # Cache the value as it will read back from the table.
+            _settings_cache[key] = json_codec.loads(encoded)
 
 
 async def save_oauth_state(state: str) -> None:
     db = await get_db()
-    await db.execute(
-        "INSERT INTO oauth_states (state) VALUES (?)",
-        (state,)
-    )
-    await db.commit()
+    async with _get_write_lock():
+        await db.execute(
+            "INSERT INTO oauth_states (state) VALUES (?)",
+            (state,)
+        )
+        await db.commit()
 
 
 async def get_and_delete_oauth_state(state: str) -> bool:
     db = await get_db()
     
-    # Check if exists and is valid (e.g. < 10 mins old)
-    cursor = await db.execute(
-        """
-        SELECT state FROM oauth_states 
-        WHERE state = ? AND created_at > datetime('now', '-10 minutes')
-        """,
-        (state,)
-    )
-    row = await cursor.fetchone()
-    
-    if not row:
-        return False
+    async with _get_write_lock():
+        # Check if exists and is valid (e.g. < 10 mins old)
+        cursor = await db.execute(
+            """
+            SELECT state FROM oauth_states 
+            WHERE state = ? AND created_at > datetime('now', '-10 minutes')
+            """,
+            (state,)
+        )
+        row = await cursor.fetchone()
         
-    await db.execute("DELETE FROM oauth_states WHERE state = ?", (state,))
-    await db.commit()
-    return True
+        if not row:
+            return False
+            
+        await db.execute("DELETE FROM oauth_states WHERE state = ?", (state,))
+        await db.commit()
+        return True
 
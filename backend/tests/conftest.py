@@ -5,13 +5,17 @@ from pathlib import Path
 
 import pytest
 
-backend_path = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_path))
+backend_path = str(Path(__file__).parent.parent)
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
 
 os.environ.setdefault("QUMAIL_SECRET_KEY", "test-secret-key-for-testing-only")
 os.environ.setdefault("QUMAIL_API_TOKEN", "test-api-token")
 os.environ.setdefault("KM_URL", "http://127.0.0.1:8200")
 os.environ["QUMAIL_DEV_MODE"] = "1"
+# One in-memory database per pytest-xdist worker ("main" when run serially).
+_worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+os.environ.setdefault("DB_URI", f"file:qumail_test_{_worker}?mode=memory&cache=shared")
 
 
 @pytest.fixture(scope="session")
@@ -21,6 +25,60 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def shared_db():
+    # Holds the shared in-memory database open for the whole run (the app's
+    # own connection may be closed and reopened) and creates the schema once.
+    import sqlite3
+    from storage.database import _SCHEMA_SQL
+    
+    # Read the URI from the environment: some test modules put key_manager's
+    # config first on sys.path.
+    conn = sqlite3.connect(os.environ["DB_URI"], uri=True, isolation_level=None)
+    conn.executescript(_SCHEMA_SQL)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_db(shared_db):
+    from policy_engine.validator import invalidate_recipient_cache
+    from storage import database
+    
+    tables = shared_db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+    ).fetchall()
+    shared_db.executescript("".join(f"DELETE FROM {name};" for (name,) in tables))
+    # The app outlives each test, so drop what it cached from the old rows too.
+    database._settings_cache = None
+    invalidate_recipient_cache()
+    yield
+
+
+@pytest.fixture(scope="session")
+def client():
+    # One app + TestClient for the whole run: startup (DB init, route
+    # registration) happens once instead of per test class.
+    from fastapi.testclient import TestClient
+    from main import app
+    
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def valid_token(client):
+    # Tokens live for token_expire_minutes (a day by default), so one per run is enough.
+    from config import settings
+    response = client.post(
+        "/api/v1/auth/token",
+        json={"app_secret": settings.api_token}
+    )
+    if response.status_code == 200:
+        return response.json()["access_token"]
+    return "test-token"
+
+
 @pytest.fixture
 def sample_plaintext():
     return b"Hello, this is a test message for QuMail encryption testing!"
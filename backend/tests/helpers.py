@@ -0,0 +1,2 @@
+# Adds 1 (mod 256) to every byte; bytes.translate does it in C.
+ROT1_TABLE = bytes.maketrans(bytes(range(256)), bytes(range(1, 256)) + b"\x00")
@@ -1,5 +1,6 @@
 import os
 import pytest
+from unittest.mock import patch
 from crypto_engine.aes_gcm import (
     aes_encrypt,
     aes_decrypt,
@@ -10,6 +11,7 @@ from crypto_engine.aes_gcm import (
     NONCE_SIZE,
     TAG_SIZE,
 )
+from tests.helpers import ROT1_TABLE
 
 
 class TestAESEncryption:
@@ -50,13 +52,13 @@ class TestAESEncryption:
     
     def test_tampered_ciphertext_fails_decryption(self, sample_plaintext, aes_key):
         ciphertext, nonce, tag = aes_encrypt(sample_plaintext, aes_key)
-        tampered = bytes([(b + 1) % 256 for b in ciphertext])
+        tampered = ciphertext.translate(ROT1_TABLE)
         with pytest.raises(Exception):
             aes_decrypt(tampered, aes_key, nonce, tag)
     
     def test_tampered_tag_fails_decryption(self, sample_plaintext, aes_key):
         ciphertext, nonce, tag = aes_encrypt(sample_plaintext, aes_key)
-        tampered_tag = bytes([(b + 1) % 256 for b in tag])
+        tampered_tag = tag.translate(ROT1_TABLE)
         with pytest.raises(Exception):
             aes_decrypt(ciphertext, aes_key, nonce, tampered_tag)
     
@@ -67,12 +69,17 @@ class TestAESEncryption:
             aes_decrypt(ciphertext, wrong_key, nonce, tag)
     
     def test_unique_nonces_per_encryption(self, sample_plaintext, aes_key):
-        nonces = set()
-        for _ in range(100):
-            _, nonce, _ = aes_encrypt(sample_plaintext, aes_key)
-            nonces.add(nonce)
+        nonces = {aes_encrypt(sample_plaintext, aes_key)[1] for _ in range(100)}
         assert len(nonces) == 100
     
+    def test_each_encryption_draws_a_fresh_nonce(self, sample_plaintext, aes_key):
+        with patch("crypto_engine.aes_gcm.os.urandom", wraps=os.urandom) as mock_urandom:
+            for _ in range(10):
+                aes_encrypt(sample_plaintext, aes_key)
+        
+        assert mock_urandom.call_count == 10
+        mock_urandom.assert_called_with(NONCE_SIZE)
+    
     def test_associated_data_authentication(self, sample_plaintext, aes_key):
         aad = b"authenticated but not encrypted"
         ciphertext, nonce, tag = aes_encrypt(sample_plaintext, aes_key, aad)
@@ -132,6 +139,13 @@ class TestKeyGeneration:
         unique_keys = set(keys)
         assert len(unique_keys) == 100
     
+    def test_generate_aes_key_uses_os_urandom(self):
+        with patch("crypto_engine.aes_gcm.os.urandom", return_value=b"\x01" * KEY_SIZE) as mock_urandom:
+            key = generate_aes_key()
+        
+        mock_urandom.assert_called_once_with(KEY_SIZE)
+        assert key == b"\x01" * KEY_SIZE
+    
     def test_generated_key_works_for_encryption(self, sample_plaintext):
         key = generate_aes_key()
         ciphertext, nonce, tag = aes_encrypt(sample_plaintext, key)
@@ -1,31 +1,8 @@
-import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
-from fastapi.testclient import TestClient
-import sys
-from pathlib import Path
-
-backend_path = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_path))
 
 
 class TestAuthRoutes:
 
-    @pytest.fixture
-    def client(self):
-        from main import app
-        return TestClient(app)
-
-    @pytest.fixture
-    def valid_token(self, client):
-        from config import settings
-        response = client.post(
-            "/api/v1/auth/token",
-            json={"app_secret": settings.api_token}
-        )
-        if response.status_code == 200:
-            return response.json()["access_token"]
-        return "test-token"
-
     def test_token_generation_success(self, client):
         from config import settings
         response = client.post(
@@ -56,22 +33,6 @@ class TestAuthRoutes:
 
 class TestSecurityRoutes:
 
-    @pytest.fixture
-    def client(self):
-        from main import app
-        return TestClient(app)
-
-    @pytest.fixture
-    def valid_token(self, client):
-        from config import settings
-        response = client.post(
-            "/api/v1/auth/token",
-            json={"app_secret": settings.api_token}
-        )
-        if response.status_code == 200:
-            return response.json()["access_token"]
-        return "test-token"
-
     def test_security_levels_endpoint(self, client, valid_token):
         response = client.get(
             "/api/v1/security/levels",
@@ -97,22 +58,6 @@ class TestSecurityRoutes:
 
 class TestEmailRoutes:
 
-    @pytest.fixture
-    def client(self):
-        from main import app
-        return TestClient(app)
-
-    @pytest.fixture
-    def valid_token(self, client):
-        from config import settings
-        response = client.post(
-            "/api/v1/auth/token",
-            json={"app_secret": settings.api_token}
-        )
-        if response.status_code == 200:
-            return response.json()["access_token"]
-        return "test-token"
-
     def test_list_emails_requires_auth(self, client):
         response = client.get("/api/v1/emails")
         assert response.status_code in [401, 403]
@@ -132,22 +77,6 @@ class TestEmailRoutes:
 
 class TestAPIValidation:
 
-    @pytest.fixture
-    def client(self):
-        from main import app
-        return TestClient(app)
-
-    @pytest.fixture
-    def valid_token(self, client):
-        from config import settings
-        response = client.post(
-            "/api/v1/auth/token",
-            json={"app_secret": settings.api_token}
-        )
-        if response.status_code == 200:
-            return response.json()["access_token"]
-        return "test-token"
-
     def test_invalid_security_level_rejected(self, client, valid_token):
         response = client.post(
             "/api/v1/emails/send",
@@ -172,11 +101,6 @@ class TestAPIValidation:
 
 class TestHealthCheck:
 
-    @pytest.fixture
-    def client(self):
-        from main import app
-        return TestClient(app)
-
     def test_root_endpoint(self, client):
         response = client.get("/")
         assert response.status_code == 200
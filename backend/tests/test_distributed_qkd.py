@@ -1,5 +1,4 @@
 import unittest
-import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 from pathlib import Path
 import sys
@@ -61,11 +60,10 @@ class TestDistributedQKD(unittest.IsolatedAsyncioTestCase):
         )
         
         # Execute
-        await link.push_key("remote-peer", entry)
+        self.assertTrue(link.push_key("remote-peer", entry))
         
-        # Wait for background tasks to complete
-        if link._background_tasks:
-            await asyncio.gather(*link._background_tasks)
+        # Wait for the queued push to be sent
+        await link.flush()
         
         # Verify
         mock_instance.post.assert_called_once()
@@ -73,12 +71,41 @@ class TestDistributedQKD(unittest.IsolatedAsyncioTestCase):
         url = call_args[0][0]
         kwargs = call_args[1]
         
-        self.assertEqual(url, "http://remote:8100/api/v1/keys/exchange")
+        self.assertEqual(url, "http://remote:8100/api/v1/keys/exchange:batch")
         self.assertEqual(kwargs["headers"]["X-QKD-Link-Secret"], "secret123")
         
         payload = kwargs["json"]
-        self.assertEqual(payload["key_id"], "test-key-1")
-        self.assertEqual(payload["peer_id"], "km-local")
+        self.assertEqual(len(payload), 1)
+        self.assertEqual(payload[0]["key_id"], "test-key-1")
+        self.assertEqual(payload[0]["peer_id"], "km-local")
+        
+        await link.shutdown()
+
+    @patch("httpx.AsyncClient")
+    async def test_qkd_link_reuses_one_client(self, mock_client_cls):
+        mock_instance = AsyncMock()
+        mock_client_cls.return_value = mock_instance
+        mock_instance.post.return_value.status_code = 200
+        
+        settings.peers = {"remote-peer": "http://remote:8100"}
+        link = QKDLink()
+        
+        for i in range(1000):
+            entry = KeyEntry(
+                key_id=f"push-key-{i}",
+                key_material=b"\x00" * 32,
+                peer_id="remote-peer",
+                key_type="aes_seed",
+                created_at=datetime.now(timezone.utc),
+            )
+            link.push_key("remote-peer", entry)
+        
+        await link.flush()
+        
+        mock_client_cls.assert_called_once()
+        batches = [c.kwargs["json"] for c in mock_instance.post.call_args_list]
+        self.assertEqual(len(batches), 16)
+        self.assertEqual(sum(len(b) for b in batches), 1000)
         
         await link.shutdown()
 
@@ -114,6 +141,30 @@ class TestDistributedQKD(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(retrieved.key_material, b"\x99" * 32)
         self.assertEqual(retrieved.peer_id, "remote-sender")
 
+    async def test_key_batch_injection(self):
+        now = datetime.now(timezone.utc)
+        entries = [
+            KeyEntry(
+                key_id=f"batch-key-{i}",
+                key_material=bytearray(32),
+                peer_id="remote-sender",
+                key_type="aes_seed",
+                created_at=now,
+            )
+            for i in range(1000)
+        ]
+        
+        with patch.object(self.pool, "_persist") as persist_mock:
+            injected = self.pool.inject_key_batch(entries)
+            # Re-sent keys are ignored
+            reinjected = self.pool.inject_key_batch(entries[:10])
+        
+        self.assertEqual(injected, 1000)
+        self.assertEqual(reinjected, 0)
+        persist_mock.assert_called_once()
+        self.assertIsNotNone(self.pool.get_key("batch-key-999"))
+        self.assertEqual(self.pool.get_stats()["keys_in_memory"], 1000)
+
 if __name__ == "__main__":
     import traceback
     try:
@@ -67,6 +67,19 @@ class TestKeyDerivation:
         ikm = os.urandom(32)
         with pytest.raises(ValueError, match="Invalid key length"):
             derive_key(ikm, b"context", 255 * 32 + 1)
+    
+    def test_derive_key_matches_rfc5869_vector(self):
+        # RFC 5869 appendix A.1 (HKDF-SHA256, basic test case)
+        okm = derive_key(
+            bytes.fromhex("0b" * 22),
+            bytes.fromhex("f0f1f2f3f4f5f6f7f8f9"),
+            42,
+            salt=bytes.fromhex("000102030405060708090a0b0c"),
+        )
+        assert okm.hex() == (
+            "3cb25f25faacd57a90434f64d0362f2a2d2d0a90cf1a5a4c5db02d56ecc4c5bf"
+            "34007208d5b887185865"
+        )
 
 
 class TestDeriveMultipleKeys:
@@ -93,6 +106,23 @@ class TestDeriveMultipleKeys:
         assert result[0] != result[1]
         assert result[1] != result[2]
         assert result[0] != result[2]
+    
+    def test_derive_multiple_keys_matches_single_derivations(self):
+        ikm = os.urandom(32)
+        contexts = [(b"key1", 32), (b"key2", 80)]
+        result = derive_multiple_keys(ikm, contexts, salt=b"salt")
+        assert result == [derive_key(ikm, c, n, salt=b"salt") for c, n in contexts]
+    
+    def test_derive_multiple_keys_extracts_once(self):
+        from unittest.mock import patch
+        from crypto_engine import key_derivation
+        
+        with patch.object(
+            key_derivation, "_hkdf_extract", wraps=key_derivation._hkdf_extract
+        ) as spy:
+            derive_multiple_keys(os.urandom(32), [(b"key1", 16), (b"key2", 32), (b"key3", 64)])
+        
+        assert spy.call_count == 1
 
 
 class TestDeriveEmailKeys:
@@ -137,3 +167,10 @@ class TestDeriveEmailKeys:
         email_id = "test-email-12345"
         result = derive_email_keys(qkd_key, email_id)
         assert result["encryption_key"] != result["mac_key"]
+    
+    def test_derive_email_keys_match_individual_derivations(self):
+        ikm = os.urandom(32)
+        keys = derive_email_keys(ikm, "msg-1")
+        assert keys["encryption_key"] == derive_key(ikm, b"qumail-email-msg-1-enc", 32)
+        assert keys["mac_key"] == derive_key(ikm, b"qumail-email-msg-1-mac", 32)
+        assert keys["iv_seed"] == derive_key(ikm, b"qumail-email-msg-1-iv", 16)
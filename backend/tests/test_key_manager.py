@@ -1,11 +1,6 @@
 import pytest
 import httpx
 from unittest.mock import AsyncMock, patch, MagicMock
-import sys
-from pathlib import Path
-
-backend_path = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_path))
 
 
 class TestKeyManagerAPI:
@@ -95,6 +90,16 @@ class TestKeyManagerAPI:
         success = mock_key_pool.consume_key(entry.key_id)
         assert success is False
 
+    def test_consume_key_status_distinguishes_failures(self, mock_key_pool):
+        from key_manager.core.key_pool import (
+            CONSUME_ALREADY_CONSUMED, CONSUME_NOT_FOUND, CONSUME_OK,
+        )
+        entry = mock_key_pool.allocate_key("test@example.com", 32)
+        
+        assert mock_key_pool.consume_key_status(entry.key_id) == CONSUME_OK
+        assert mock_key_pool.consume_key_status(entry.key_id) == CONSUME_ALREADY_CONSUMED
+        assert mock_key_pool.consume_key_status("nonexistent-key-id") == CONSUME_NOT_FOUND
+
     def test_delete_key(self, mock_key_pool):
         entry = mock_key_pool.allocate_key(
             peer_id="test@example.com",
@@ -126,6 +131,64 @@ class TestKeyManagerAPI:
         new_stats = mock_key_pool.get_stats()
         assert new_stats["aes_available"] == initial_aes + 50
 
+    def test_aes_seeds_sliced_from_one_draw(self, mock_key_pool):
+        from key_manager.core import key_pool
+        with patch.object(key_pool, "_secure_random", wraps=key_pool._secure_random) as spy:
+            seeds = [
+                mock_key_pool.allocate_key("test@example.com", 32).key_material
+                for _ in range(50)
+            ]
+        
+        spy.assert_not_called()
+        assert len({bytes(seed) for seed in seeds}) == 50
+        assert not any(mock_key_pool._aes_seed_pool[:50 * 32])
+
+    def test_add_aes_keys_prefills_bounded_seeds(self, mock_key_pool):
+        from key_manager.core import key_pool
+        batch = key_pool._AES_SEED_REFILL_KEYS
+        unused = bytes(mock_key_pool._aes_seed_pool)
+        
+        mock_key_pool.add_aes_keys(1_000_000)
+        
+        assert len(mock_key_pool._aes_seed_pool) == batch * key_pool._AES_SEED_BYTES
+        assert mock_key_pool._aes_seed_pool[:len(unused)] == unused
+        with patch.object(key_pool, "_secure_random_into", wraps=key_pool._secure_random_into) as spy:
+            for _ in range(batch):
+                mock_key_pool.allocate_key("test@example.com", 32)
+        
+        spy.assert_not_called()
+
+    def test_initialize_prefills_bounded_seeds(self):
+        from key_manager.core import key_pool
+        pool = key_pool.KeyPool()
+        pool.initialize(otp_bytes=1024, aes_keys=1_000_000)
+        
+        assert len(pool._aes_seed_pool) == key_pool._AES_SEED_REFILL_KEYS * key_pool._AES_SEED_BYTES
+        assert pool.get_stats()["aes_available"] == 1_000_000
+
+    def test_batch_rolled_back_when_pool_runs_out(self, mock_key_pool):
+        hook = MagicMock()
+        mock_key_pool.register_allocation_hook(hook)
+        requests = [{"peer_id": "test@example.com", "size": 32}] * 3
+        stats_before = mock_key_pool.get_stats()
+        
+        with patch.object(
+            mock_key_pool, "_check_user_quota",
+            side_effect=[None, None, ValueError("Key pool exhausted")],
+        ):
+            with pytest.raises(ValueError):
+                mock_key_pool.allocate_key_batch(requests)
+        
+        stats = mock_key_pool.get_stats()
+        for field in ("aes_available", "otp_available", "total_allocated", "keys_in_memory"):
+            assert stats[field] == stats_before[field]
+        assert mock_key_pool.get_user_stats("default")["quota_used"] == {}
+        hook.assert_not_called()
+        
+        entries = mock_key_pool.allocate_key_batch(requests)
+        assert len(entries) == 3
+        assert hook.call_count == 3
+
     def test_key_has_expiration(self, mock_key_pool):
         entry = mock_key_pool.allocate_key(
             peer_id="test@example.com",
@@ -171,6 +234,18 @@ class TestKeyLifecycle:
         success = lifecycle.reserve(key_id)
         assert success is False
 
+    def test_concurrent_consume_succeeds_once(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from key_store.lifecycle import KeyLifecycle
+        
+        lifecycle = KeyLifecycle()
+        lifecycle.track("shared-key", "otp")
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: lifecycle.mark_consumed("shared-key"), range(32)))
+        
+        assert results.count(True) == 1
+
     def test_is_consumable(self):
         from key_store.lifecycle import KeyLifecycle
         
@@ -197,3 +272,24 @@ class TestKeyLifecycle:
         stats = lifecycle.get_stats()
         assert stats["provisioned"] == 2
         assert stats["consumed"] == 1
+
+    def test_lifecycle_stats_track_transitions_and_cleanup(self):
+        from key_store.lifecycle import KeyLifecycle
+        
+        lifecycle = KeyLifecycle()
+        for i in range(10):
+            lifecycle.track(f"key{i}", "aes")
+        lifecycle.reserve("key0")
+        lifecycle.mark_used("key0")
+        lifecycle.mark_consumed("key1")
+        lifecycle.mark_zeroized("key2")
+        lifecycle.track("key2", "aes")
+        
+        stats = lifecycle.get_stats()
+        assert stats["provisioned"] == 8
+        assert stats["used"] == 1
+        assert stats["consumed"] == 1
+        assert stats["zeroized"] == 0
+        
+        assert lifecycle.cleanup_expired(max_age_seconds=-1) == 10
+        assert set(lifecycle.get_stats().values()) == {0}
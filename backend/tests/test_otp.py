@@ -6,6 +6,7 @@ from crypto_engine.otp import (
     otp_decrypt_with_mac,
     verify_otp_security,
 )
+from tests.helpers import ROT1_TABLE
 
 
 class TestOTPEncryption:
@@ -44,7 +45,7 @@ class TestOTPEncryption:
     
     def test_wrong_key_produces_wrong_plaintext(self, sample_plaintext, otp_key):
         ciphertext = otp_encrypt(sample_plaintext, otp_key)
-        wrong_key = bytes([(b + 1) % 256 for b in otp_key])
+        wrong_key = otp_key.translate(ROT1_TABLE)
         wrong_plaintext = otp_decrypt(ciphertext, wrong_key)
         assert wrong_plaintext != sample_plaintext
     
@@ -68,7 +69,7 @@ class TestOTPWithMAC:
         mac_key = bytes([i % 256 for i in range(32)])
         ciphertext, mac = otp_encrypt_with_mac(sample_plaintext, otp_key, mac_key)
         
-        tampered = bytes([(b + 1) % 256 for b in ciphertext])
+        tampered = ciphertext.translate(ROT1_TABLE)
         
         with pytest.raises(ValueError, match="MAC verification failed"):
             otp_decrypt_with_mac(tampered, mac, otp_key, mac_key)
@@ -77,7 +78,7 @@ class TestOTPWithMAC:
         mac_key = bytes([i % 256 for i in range(32)])
         ciphertext, mac = otp_encrypt_with_mac(sample_plaintext, otp_key, mac_key)
         
-        wrong_mac = bytes([(b + 1) % 256 for b in mac])
+        wrong_mac = mac.translate(ROT1_TABLE)
         
         with pytest.raises(ValueError, match="MAC verification failed"):
             otp_decrypt_with_mac(ciphertext, wrong_mac, otp_key, mac_key)
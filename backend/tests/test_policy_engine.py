@@ -0,0 +1,177 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from policy_engine.fallback import get_fallback_level
+from policy_engine.rules import SecurityRules
+from policy_engine.validator import (
+    check_recipient_capability,
+    invalidate_recipient_cache,
+    validate_send_request,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_recipient_cache():
+    invalidate_recipient_cache()
+    yield
+    invalidate_recipient_cache()
+
+
+class TestRecipientCapabilityCache:
+
+    @pytest.mark.asyncio
+    async def test_repeat_lookup_served_from_cache(self):
+        with patch("storage.database.get_known_recipient", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = {"supported_levels": [2, 4], "public_key": "pk"}
+
+            first = await check_recipient_capability("alice@example.com")
+            second = await check_recipient_capability("alice@example.com")
+
+            assert first == second
+            assert first["supported_levels"] == frozenset({2, 4})
+            assert mock_get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_fresh_lookup(self):
+        with patch("storage.database.get_known_recipient", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = None
+
+            cap = await check_recipient_capability("bob@example.com")
+            assert cap["is_qumail_user"] is False
+
+            mock_get.return_value = {"supported_levels": [3, 4]}
+            invalidate_recipient_cache("bob@example.com")
+
+            cap = await check_recipient_capability("bob@example.com")
+            assert cap["is_qumail_user"] is True
+            assert cap["supported_levels"] == frozenset({3, 4})
+            assert mock_get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_entry_is_copied_and_bounded(self, monkeypatch):
+        from policy_engine import validator
+        monkeypatch.setattr(validator, "_RECIPIENT_CACHE_MAX", 2)
+        with patch("storage.database.get_known_recipient", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = None
+
+            cap = await check_recipient_capability("a@example.com")
+            cap["supported_levels"] = frozenset({1})
+            assert (await check_recipient_capability("a@example.com"))["supported_levels"] == frozenset({1, 2, 3, 4})
+
+            await check_recipient_capability("b@example.com")
+            await check_recipient_capability("c@example.com")
+            assert list(validator._recipient_cache) == ["b@example.com", "c@example.com"]
+
+
+class TestValidateSendRequest:
+
+    @pytest.mark.asyncio
+    async def test_km_status_fetched_once(self):
+        status = {"connected": True, "available": {"otp_bytes": 10_000}}
+        with patch("storage.database.get_known_recipient", new_callable=AsyncMock) as mock_get, \
+             patch("qkd_client.get_key_status", new_callable=AsyncMock) as mock_status:
+            mock_get.return_value = None
+            mock_status.return_value = status
+
+            result = await validate_send_request(["a@example.com", "b@example.com"], 1, 100)
+
+        assert result == {"valid": True, "adjusted_level": 1}
+        assert mock_status.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_level_two_blocked_when_km_disconnected(self):
+        with patch("storage.database.get_known_recipient", new_callable=AsyncMock) as mock_get, \
+             patch("qkd_client.get_key_status", new_callable=AsyncMock) as mock_status:
+            mock_get.return_value = None
+            mock_status.return_value = {"connected": False, "available": {}}
+
+            result = await validate_send_request(["a@example.com"], 2, 100)
+
+        assert result["valid"] is False
+        assert "not connected" in result["error"]
+
+
+    @pytest.mark.asyncio
+    async def test_status_fetch_overlaps_recipient_lookup(self):
+        status_started = asyncio.Event()
+
+        async def slow_recipient(email):
+            # Only completes if the KM status call is already in flight.
+            await asyncio.wait_for(status_started.wait(), timeout=1.0)
+            return None
+
+        async def status():
+            status_started.set()
+            return {"connected": True, "available": {}}
+
+        with patch("storage.database.get_known_recipient", side_effect=slow_recipient), \
+             patch("qkd_client.get_key_status", side_effect=status):
+            result = await validate_send_request(["a@example.com"], 2, 100)
+
+        assert result == {"valid": True, "adjusted_level": 2}
+
+
+    @pytest.mark.asyncio
+    async def test_oversized_otp_rejected_before_km_call(self):
+        with patch("storage.database.get_known_recipient", new_callable=AsyncMock) as mock_get, \
+             patch("qkd_client.get_key_status", new_callable=AsyncMock) as mock_status:
+            result = await validate_send_request(
+                ["a@example.com"], 1, 1024, attachment_sizes=[1024 * 1024, 10]
+            )
+
+        assert result["valid"] is False
+        assert "Message too large for level 1" in result["error"]
+        mock_status.assert_not_called()
+        mock_get.assert_not_called()
+
+
+class TestSecurityRules:
+
+    def test_can_use_level_matches_requirements(self):
+        rules = SecurityRules()
+
+        assert rules.can_use_level(2, True, False, 10) == (True, None)
+        assert rules.can_use_level(4, False, False, 10 ** 9) == (True, None)
+        assert rules.can_use_level(2, False, False, 10) == (False, "Key Manager not connected")
+        assert rules.can_use_level(3, True, False, 10) == (
+            False, "Recipient's public key not available"
+        )
+
+    def test_can_use_level_rejects_oversized_otp(self):
+        rules = SecurityRules()
+        ok, error = rules.can_use_level(1, True, False, 1024 * 1024 + 1)
+        assert ok is False
+        assert "max: 1048576 bytes" in error
+
+    @pytest.mark.parametrize("level", [0, 5, -1])
+    def test_can_use_level_rejects_invalid_level(self, level):
+        ok, error = SecurityRules().can_use_level(level, True, True, 10)
+        assert ok is False
+        assert error == f"Invalid security level: {level}"
+
+    def test_get_available_levels(self):
+        rules = SecurityRules()
+
+        assert rules.get_available_levels(False, False) == (4,)
+        assert rules.get_available_levels(False, True) == (4,)
+        assert rules.get_available_levels(True, False) == (1, 2, 4)
+        assert rules.get_available_levels(True, True) == (1, 2, 3, 4)
+
+
+class TestFallback:
+
+    def test_fallback_prefers_next_stronger_common_level(self):
+        caps = [{"supported_levels": [2, 3, 4]}, {"supported_levels": [3, 4]}]
+        assert get_fallback_level(1, caps) == 3
+        assert get_fallback_level(2, caps) == 3
+
+    def test_fallback_to_plain_without_common_level(self):
+        caps = [{"supported_levels": [1]}, {"supported_levels": [2]}]
+        assert get_fallback_level(2, caps) == 4
+
+    def test_requirements_lookup(self):
+        rules = SecurityRules()
+        assert rules.get_requirements(3).requires_recipient_key is True
+        assert rules.get_requirements(9) is None
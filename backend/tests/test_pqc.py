@@ -1,6 +1,7 @@
 import pytest
 from crypto_engine.pqc import (
     generate_kyber_keypair,
+    generate_kyber_keypairs,
     kyber_encapsulate,
     kyber_decapsulate,
     generate_dilithium_keypair,
@@ -39,6 +40,14 @@ class TestKyberKeyGeneration:
         pairs = [generate_kyber_keypair() for _ in range(10)]
         public_keys = [p[0] for p in pairs]
         assert len(set(public_keys)) == 10
+    
+    def test_batch_keypairs_match_single_shape(self):
+        single_pub, single_sec = generate_kyber_keypair()
+        pairs = generate_kyber_keypairs(10)
+        assert len(pairs) == 10
+        assert len({p[0] for p in pairs}) == 10
+        assert all(len(pub) == len(single_pub) and len(sec) == len(single_sec) for pub, sec in pairs)
+        assert generate_kyber_keypairs(0) == []
 
 
 class TestKyberEncapsulation:
@@ -85,6 +94,23 @@ class TestKyberDecapsulation:
         result1 = sim.decap(unknown_ciphertext, secret_key)
         result2 = sim.decap(unknown_ciphertext, secret_key)
         assert result1 == result2
+    
+    def test_simulated_decap_cache_evicts_least_recently_used(self, monkeypatch):
+        from crypto_engine import pqc
+        monkeypatch.setattr(pqc, "MAX_CACHE_SIZE", 2)
+        monkeypatch.setattr(pqc, "_kyber_cache", pqc.OrderedDict())
+        sim = SimulatedKyber()
+        public_key, secret_key = sim.generate_keypair()
+        
+        ct1, ss1 = sim.encap(public_key)
+        ct2, ss2 = sim.encap(public_key)
+        assert sim.decap(ct1, secret_key) == ss1
+        ct3, ss3 = sim.encap(public_key)
+        
+        assert len(pqc._kyber_cache) == 2
+        assert sim.decap(ct1, secret_key) == ss1
+        assert sim.decap(ct3, secret_key) == ss3
+        assert sim.decap(ct2, secret_key) != ss2
 
 
 class TestDilithiumKeyGeneration:
@@ -0,0 +1,181 @@
+import pytest
+import httpx
+from unittest.mock import patch
+
+from qkd_client import client as qkd
+from qkd_client.exceptions import KEY_EXHAUSTED, KEY_NOT_FOUND, KM_ERROR, KM_UNAVAILABLE
+
+
+def _mock_km(handler):
+    return httpx.AsyncClient(
+        base_url="http://km.test",
+        transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_status_cache():
+    qkd._invalidate_status_cache()
+    yield
+    qkd._invalidate_status_cache()
+
+
+class TestKeyStatusCache:
+
+    @pytest.mark.asyncio
+    async def test_status_served_from_cache_within_ttl(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"otp_bytes_available": 500})
+
+        with patch.object(qkd, "_get_client", return_value=_mock_km(handler)):
+            first = await qkd.get_key_status()
+            second = await qkd.get_key_status()
+
+        assert first["connected"] is True
+        assert second["available"]["otp_bytes"] == 500
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_consume_invalidates_status_cache(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            if request.url.path.endswith("/consume"):
+                return httpx.Response(200, json={"consumed": True})
+            return httpx.Response(200, json={"otp_bytes_available": 500})
+
+        with patch.object(qkd, "_get_client", return_value=_mock_km(handler)):
+            await qkd.get_key_status()
+            await qkd.consume_key("key-1")
+            await qkd.get_key_status()
+
+        assert calls.count("/api/v1/keys/status") == 2
+
+    @pytest.mark.asyncio
+    async def test_peer_status_not_cached(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"otp_bytes_available": 500})
+
+        with patch.object(qkd, "_get_client", return_value=_mock_km(handler)):
+            await qkd.get_key_status(peer_id="bob@example.com")
+            await qkd.get_key_status(peer_id="bob@example.com")
+
+        assert len(calls) == 2
+
+
+class TestKeyTransport:
+
+    @pytest.mark.asyncio
+    async def test_request_key_reads_raw_octet_stream(self):
+        material = bytes(range(256)) * 4
+
+        def handler(request):
+            assert "application/octet-stream" in request.headers["accept"]
+            return httpx.Response(
+                200,
+                content=material,
+                headers={
+                    "Content-Type": "application/octet-stream",
+                    "X-Key-Id": "raw-key",
+                    "X-Key-Peer-Id": "bob@example.com",
+                    "X-Key-Type": "otp",
+                    "X-Key-Created-At": "2024-01-01T00:00:00+00:00",
+                },
+            )
+
+        with patch.object(qkd, "_get_client", return_value=_mock_km(handler)):
+            key = await qkd.request_key("bob@example.com", len(material), "otp")
+
+        assert key.key_id == "raw-key"
+        assert key.key_material == material
+        assert key.created_at.year == 2024
+
+    @pytest.mark.asyncio
+    async def test_get_key_falls_back_to_json(self):
+        def handler(request):
+            return httpx.Response(200, json={
+                "key_id": "json-key",
+                "key_material": "AAECAw==",
+                "peer_id": "bob@example.com",
+                "key_type": "aes_seed",
+            })
+
+        with patch.object(qkd, "_get_client", return_value=_mock_km(handler)):
+            key = await qkd.get_key("json-key")
+
+        assert key.key_material == b"\x00\x01\x02\x03"
+        assert key.peer_id == "bob@example.com"
+
+
+class TestBatchKeyRequest:
+
+    @pytest.mark.asyncio
+    async def test_batch_returns_keys_in_request_order(self):
+        def handler(request):
+            assert request.url.path == "/api/v1/keys/request:batch"
+            body = qkd.json_codec.loads(request.content)
+            return httpx.Response(200, json=[
+                {
+                    "key_id": f"key-{i}",
+                    "key_material": "AAAA",
+                    "peer_id": item["peer_id"],
+                    "key_type": item["key_type"],
+                    "created_at": "2024-01-01T00:00:00+00:00",
+                }
+                for i, item in enumerate(body)
+            ])
+
+        requests = [("a@example.com", 32, "aes_seed"), ("b@example.com", 32, "aes_seed")]
+        with patch.object(qkd, "_get_client", return_value=_mock_km(handler)):
+            keys = await qkd.request_keys_batch(requests)
+
+        assert [k.key_id for k in keys] == ["key-0", "key-1"]
+        assert [k.peer_id for k in keys] == ["a@example.com", "b@example.com"]
+        assert keys[0].key_material == b"\x00\x00\x00"
+
+    @pytest.mark.asyncio
+    async def test_batch_exhaustion_raises(self):
+        def handler(request):
+            return httpx.Response(503, json={"detail": "Insufficient"})
+
+        with patch.object(qkd, "_get_client", return_value=_mock_km(handler)):
+            with pytest.raises(qkd.KeyExhaustedError):
+                await qkd.request_keys_batch([("a@example.com", 32, "aes_seed")])
+
+
+class TestStatusErrors:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status_code,exc_type,code", [
+        (404, "KeyNotFoundError", KEY_NOT_FOUND),
+        (410, "KeyExhaustedError", KEY_EXHAUSTED),
+        (500, "KeyRequestError", KM_ERROR),
+    ])
+    async def test_get_key_maps_status_codes(self, status_code, exc_type, code):
+        def handler(request):
+            return httpx.Response(status_code, json={"detail": "x"})
+
+        with patch.object(qkd, "_get_client", return_value=_mock_km(handler)):
+            with pytest.raises(getattr(qkd, exc_type)) as excinfo:
+                await qkd.get_key("missing-key")
+
+        assert type(excinfo.value).__name__ == exc_type
+        assert excinfo.value.code == code
+
+    @pytest.mark.asyncio
+    async def test_unreachable_km_reports_unavailable_code(self):
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        with patch.object(qkd, "_get_client", return_value=_mock_km(handler)):
+            with pytest.raises(qkd.KeyRequestError) as excinfo:
+                await qkd.consume_key("some-key")
+
+        assert excinfo.value.code == KM_UNAVAILABLE
@@ -1,11 +1,9 @@
+import numpy as np
 import pytest
 import os
 import sys
 from pathlib import Path
 
-backend_path = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_path))
-
 
 class TestQuantumSimEntropy:
 
@@ -67,6 +65,33 @@ class TestQuantumSimEntropy:
         
         assert len(unique_samples) == 100
     
+    def test_csprng_calls_continue_one_keystream(self):
+        from unittest.mock import MagicMock
+        from crypto_engine.quantum_sim import ChaCha20CSPRNG
+        
+        pool = MagicMock()
+        pool.extract.return_value = bytes(range(64))
+        
+        chunked = ChaCha20CSPRNG(pool)
+        parts = chunked.generate(32) + chunked.generate(32)
+        buf = bytearray(64)
+        chunked.generate_into(buf)
+        
+        assert parts + bytes(buf) == ChaCha20CSPRNG(pool).generate(128)
+    
+    def test_csprng_generate_into_fills_buffer(self):
+        from crypto_engine.quantum_sim import ChaCha20CSPRNG, EntropyPool
+        
+        csprng = ChaCha20CSPRNG(EntropyPool())
+        buf = bytearray(4096)
+        assert csprng.generate_into(memoryview(buf)[1024:3072]) == 2048
+        
+        assert not any(buf[:1024]) and not any(buf[3072:])
+        assert len(set(buf[1024:3072])) > 200
+        
+        with pytest.raises(ValueError):
+            csprng.generate_into(bytearray())
+    
     def test_global_generate_quantum_bytes(self):
         from crypto_engine.quantum_sim import generate_quantum_bytes
         
@@ -107,12 +132,10 @@ class TestQuantumSimEntropy:
         
         data = generate_quantum_bytes(10000)
         
-        byte_counts = [0] * 256
-        for b in data:
-            byte_counts[b] += 1
+        byte_counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
         
         expected = len(data) / 256
-        chi_squared = sum((count - expected) ** 2 / expected for count in byte_counts)
+        chi_squared = float(((byte_counts - expected) ** 2).sum() / expected)
         
         assert chi_squared < 350
     
@@ -122,6 +145,14 @@ class TestQuantumSimEntropy:
         data = generate_quantum_bytes(1024 * 1024)
         
         assert len(data) == 1024 * 1024
+    
+    def test_large_key_generation_into_buffer(self):
+        from crypto_engine.quantum_sim import generate_quantum_bytes_into
+        
+        buf = bytearray(1024 * 1024)
+        
+        assert generate_quantum_bytes_into(memoryview(buf)) == len(buf)
+        assert any(buf[-64:])
 
 
 class TestSecureRandomIntegration:
@@ -231,6 +262,45 @@ class TestKeyPoolPersistence:
         
         pool2.shutdown()
     
+    def test_persist_encodes_each_entry_once(self, temp_persistence_path):
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent / "key_manager"))
+        
+        from unittest.mock import patch
+        from core.key_pool import KeyEntry, KeyPool
+        
+        pool = KeyPool(
+            persistence_enabled=True,
+            persistence_path=temp_persistence_path,
+            persistence_password="test_password_123",
+        )
+        pool.initialize(otp_bytes=1000, aes_keys=10)
+        
+        with patch.object(KeyEntry, "to_dict", autospec=True, side_effect=KeyEntry.to_dict) as spy:
+            entries = [pool.allocate_key("test@example.com", 32) for _ in range(5)]
+            pool.consume_key(entries[0].key_id)
+            pool.delete_key(entries[1].key_id)
+        
+        assert spy.call_count == 6
+        assert set(pool._serialized_keys) == {e.key_id for e in entries[2:]} | {entries[0].key_id}
+        assert pool._serialized_keys[entries[0].key_id]["consumed"] is True
+        
+        pool.shutdown()
+    
+    def test_no_snapshots_without_persistence(self):
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent / "key_manager"))
+        
+        from core.key_pool import KeyPool
+        
+        pool = KeyPool()
+        pool.initialize(otp_bytes=1000, aes_keys=10)
+        
+        entry = pool.allocate_key("test@example.com", 32)
+        pool.consume_key(entry.key_id)
+        
+        assert pool._serialized_keys == {}
+        
+        pool.shutdown()
+    
     def test_audit_logging(self, temp_persistence_path, temp_audit_path):
         sys.path.insert(0, str(Path(__file__).parent.parent.parent / "key_manager"))
         
@@ -251,14 +321,13 @@ class TestKeyPoolPersistence:
         )
         
         pool.consume_key(entry.key_id)
+        pool.shutdown()
         
         assert temp_audit_path.exists()
         
         audit_content = temp_audit_path.read_text()
         assert "ALLOCATE" in audit_content
         assert "CONSUME" in audit_content
-        
-        pool.shutdown()
 
 
 class TestAuditLogIntegrity:
@@ -277,6 +346,24 @@ class TestAuditLogIntegrity:
         
         assert logger.verify_chain() is True
     
+    def test_records_buffered_until_flush(self, tmp_path):
+        sys.path.insert(0, str(Path(__file__).parent.parent.parent / "key_manager"))
+        
+        from core.persistent_store import AuditLogger
+        
+        audit_path = tmp_path / "audit.log"
+        logger = AuditLogger(audit_path)
+        
+        for i in range(3):
+            logger.log("ACTION", f"key-{i:03}")
+        
+        assert not audit_path.exists()
+        
+        logger.flush()
+        
+        assert len(audit_path.read_text().splitlines()) == 3
+        assert AuditLogger(audit_path).verify_chain() is True
+    
     def test_tamper_detection(self, tmp_path):
         sys.path.insert(0, str(Path(__file__).parent.parent.parent / "key_manager"))
         
@@ -287,6 +374,7 @@ class TestAuditLogIntegrity:
         
         logger.log("ACTION_1", "key-001", {"detail": "test1"})
         logger.log("ACTION_2", "key-002", {"detail": "test2"})
+        logger.flush()
         
         content = audit_path.read_text()
         tampered = content.replace("key-001", "key-XXX")
@@ -1,4 +1,5 @@
 import os
+import numpy as np
 import pytest
 from crypto_engine.secure_random import secure_random_bytes
 
@@ -28,19 +29,27 @@ class TestSecureRandom:
         unique_bytes = len(set(result))
         assert unique_bytes >= 200
     
+    def test_small_requests_share_one_refill(self):
+        from unittest.mock import patch
+        from crypto_engine import secure_random
+        
+        with patch.object(secure_random, "_small_pool_pos", secure_random._SMALL_POOL_SIZE), \
+             patch.object(secure_random, "generate_quantum_bytes_into",
+                          wraps=secure_random.generate_quantum_bytes_into) as spy:
+            results = [secure_random_bytes(32) for _ in range(128)]
+        
+        assert spy.call_count == 1
+        assert len(set(results)) == 128
+    
     def test_secure_random_bytes_large_size(self):
         result = secure_random_bytes(1024 * 1024)
         assert len(result) == 1024 * 1024
     
     def test_secure_random_bytes_distribution(self):
         result = secure_random_bytes(10000)
-        byte_counts = {}
-        for b in result:
-            byte_counts[b] = byte_counts.get(b, 0) + 1
+        byte_counts = np.bincount(np.frombuffer(result, dtype=np.uint8), minlength=256)
         
-        min_count = min(byte_counts.values())
-        max_count = max(byte_counts.values())
-        assert max_count < min_count * 5
+        assert byte_counts.max() < byte_counts.min() * 5
 
 
 class TestSecureRandomIntegration:
@@ -0,0 +1,200 @@
+import time
+
+import aiosqlite
+import pytest
+from unittest.mock import patch
+
+from storage import database
+
+
+@pytest.fixture
+async def memory_db():
+    conn = await aiosqlite.connect(":memory:")
+    conn.row_factory = aiosqlite.Row
+    await conn.execute(database._FOREIGN_KEYS_PRAGMA)
+    # Run against a private connection, flusher and settings cache so the
+    # session-wide app client's state is left untouched.
+    with patch.multiple(
+        database,
+        _db_connection=conn,
+        _audit_queue=None,
+        _audit_flusher_task=None,
+        _settings_cache=None,
+        _settings_lock=None,
+        _write_lock=None,
+    ):
+        await database.init_database()
+        yield conn
+        await database.close_database()
+
+
+async def _count(db, table):
+    cursor = await db.execute(f"SELECT COUNT(*) FROM {table}")
+    return (await cursor.fetchone())[0]
+
+
+class TestAuditLog:
+
+    @pytest.mark.asyncio
+    async def test_burst_written_in_one_batch(self, memory_db):
+        with patch.object(memory_db, "executemany", wraps=memory_db.executemany) as spy:
+            for i in range(10):
+                await database.log_audit_event("send", {"n": i})
+            await database.flush_audit_log()
+
+        assert spy.call_count == 1
+        assert await _count(memory_db, "audit_log") == 10
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending_events(self, memory_db):
+        with patch.object(memory_db, "executemany", wraps=memory_db.executemany) as spy:
+            await database.log_audit_event("login", {"user": "a@example.com"})
+            await database.close_database()
+
+        assert database._audit_flusher_task is None
+        assert list(spy.call_args.args[1]) == [("login", '{"user":"a@example.com"}')]
+
+
+class TestLookups:
+
+    @pytest.mark.asyncio
+    async def test_oauth_tokens_round_trip(self, memory_db):
+        await database.store_oauth_tokens("a@example.com", "access", "refresh", 3600)
+        await database.store_oauth_tokens("a@example.com", "access-2", None, 3600)
+
+        tokens = await database.get_oauth_tokens("a@example.com")
+
+        assert isinstance(tokens, database.OAuthTokens)
+        assert tokens.access_token == "access-2"
+        assert tokens.refresh_token == "refresh"
+        assert isinstance(tokens.expires_at, int)
+        assert 0 < tokens.expires_at - time.time() <= 3600
+        assert await database.get_oauth_tokens("missing@example.com") is None
+
+    @pytest.mark.asyncio
+    async def test_known_recipient_round_trip(self, memory_db):
+        await database.store_known_recipient("b@example.com", "PUBKEY", [2, 4])
+
+        recipient = await database.get_known_recipient("b@example.com")
+
+        assert recipient["is_qumail_user"] is True
+        assert recipient["public_key"] == "PUBKEY"
+        assert recipient["public_key_fingerprint"].startswith("SHA256:")
+        assert recipient["supported_levels"] == [2, 4]
+
+    @pytest.mark.asyncio
+    async def test_known_recipient_levels_replaced(self, memory_db):
+        await database.store_known_recipient("b@example.com", "PUBKEY", [1, 2, 3])
+        await database.store_known_recipient("b@example.com", None, [3])
+
+        recipient = await database.get_known_recipient("b@example.com")
+
+        assert recipient["supported_levels"] == [3]
+        assert recipient["public_key"] == "PUBKEY"
+
+    @pytest.mark.asyncio
+    async def test_known_recipient_levels_backfilled(self, memory_db):
+        await memory_db.execute(
+            "INSERT INTO known_recipients (email, is_qumail_user, supported_levels) VALUES (?, 1, ?)",
+            ("old@example.com", "[2, 4]"),
+        )
+        await database.init_database()
+
+        recipient = await database.get_known_recipient("old@example.com")
+
+        assert recipient["supported_levels"] == [2, 4]
+
+    @pytest.mark.asyncio
+    async def test_known_recipient_levels_backfilled_after_upgrade(self, memory_db):
+        await database.store_known_recipient("new@example.com", "PUBKEY", [3])
+        await memory_db.execute(
+            "INSERT INTO known_recipients (email, is_qumail_user, supported_levels) VALUES (?, 1, ?)",
+            ("old@example.com", "[2, 4]"),
+        )
+        await database.init_database()
+
+        recipient = await database.get_known_recipient("old@example.com")
+
+        assert recipient["supported_levels"] == [2, 4]
+
+    @pytest.mark.asyncio
+    async def test_known_recipient_write_rolled_back_on_error(self, memory_db):
+        await database.store_known_recipient("b@example.com", "PUBKEY", [2, 4])
+
+        with patch.object(memory_db, "executemany", side_effect=RuntimeError("disk full")):
+            with pytest.raises(RuntimeError):
+                await database.store_known_recipient("b@example.com", "PUBKEY-2", [3])
+
+        recipient = await database.get_known_recipient("b@example.com")
+
+        assert recipient["public_key"] == "PUBKEY"
+        assert recipient["supported_levels"] == [2, 4]
+
+    @pytest.mark.asyncio
+    async def test_known_recipient_levels_cascade_on_delete(self, memory_db):
+        await database.store_known_recipient("b@example.com", "PUBKEY", [2, 4])
+
+        await memory_db.execute("DELETE FROM known_recipients WHERE email = ?", ("b@example.com",))
+
+        assert await _count(memory_db, "known_recipient_levels") == 0
+
+    @pytest.mark.asyncio
+    async def test_stored_accounts_projection(self, memory_db):
+        await database.store_oauth_tokens("a@example.com", "access", "refresh", 3600, provider="outlook")
+
+        accounts = await database.get_stored_accounts()
+
+        assert len(accounts) == 1
+        assert accounts[0]["email"] == "a@example.com"
+        assert accounts[0]["provider"] == "outlook"
+        assert set(accounts[0]) == {"email", "provider", "connected_at"}
+
+
+class TestSettingsCache:
+
+    @pytest.mark.asyncio
+    async def test_settings_served_from_cache_after_first_read(self, memory_db):
+        await database.save_setting("theme", "dark")
+        assert await database.get_settings() == {"theme": "dark"}
+
+        with patch.object(memory_db, "execute", wraps=memory_db.execute) as spy:
+            settings = await database.get_settings()
+            settings["theme"] = "mutated"
+
+            assert await database.get_settings() == {"theme": "dark"}
+            spy.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_save_setting_updates_cache(self, memory_db):
+        await database.get_settings()
+        await database.save_setting("security_level", 3)
+        await database.save_setting("recent", ("a", "b"))
+
+        assert await database.get_settings() == {"security_level": 3, "recent": ["a", "b"]}
+
+
+class TestBatchSaves:
+
+    @pytest.mark.asyncio
+    async def test_sent_emails_written_in_one_batch(self, memory_db):
+        entries = [
+            database.SentEmail(f"<m{i}@x>", "a@example.com", ["b@example.com"], [], "hi", "body", 2, None)
+            for i in range(5)
+        ]
+        with patch.object(memory_db, "executemany", wraps=memory_db.executemany) as spy:
+            await database.save_sent_emails(entries)
+
+        assert spy.call_count == 1
+        assert await _count(memory_db, "sent_emails") == 5
+
+    @pytest.mark.asyncio
+    async def test_draft_wrapper_upserts(self, memory_db):
+        await database.save_email_draft("d1", ["b@example.com"], [], "first", "body", 4)
+        await database.save_email_drafts([
+            database.EmailDraft("d1", ["b@example.com"], ["c@example.com"], "second", "body", 4),
+            database.EmailDraft("d2", [], [], "other", "", 2),
+        ])
+
+        cursor = await memory_db.execute("SELECT id, subject, cc_addrs FROM drafts ORDER BY id")
+        rows = [tuple(r) for r in await cursor.fetchall()]
+        assert rows == [("d1", "second", '["c@example.com"]'), ("d2", "other", "[]")]
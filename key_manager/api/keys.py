@@ -1,14 +1,70 @@
-import base64
+import asyncio
+import hmac
 import logging
+import time
 from datetime import datetime, timezone
-from typing import Optional, Dict
+from typing import List, Optional, Dict
 
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from pydantic import BaseModel, Field
 
+# pybase64 (optional) encodes/decodes with SIMD; output is identical.
+try:
+    from pybase64 import b64decode, b64encode
+except ImportError:
+    from base64 import b64decode, b64encode
+
+from config import settings
+from core.key_pool import CONSUME_NOT_FOUND, CONSUME_OK
+
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+RAW_KEY_MEDIA_TYPE = "application/octet-stream"
+MAX_BATCH_SIZE = 100
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") swapped as one tuple so concurrent
+# readers never pair a new second with an old prefix.
+_ts_cache = (0, "")
+
+
+def _utcnow_iso() -> str:
+    """datetime.now(timezone.utc).isoformat(), rebuilding the date part once a second."""
+    global _ts_cache
+    ns = time.time_ns()
+    sec, frac = divmod(ns, 1_000_000_000)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{frac // 1000:06d}+00:00"
+
+
+def _wants_raw_key(request: Request) -> bool:
+    return RAW_KEY_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _raw_key_response(key_entry) -> Response:
+    """Return key material as the raw body with metadata in X-Key-* headers.
+    
+    Avoids base64-inflating large OTP keys for clients that opt in via Accept.
+    """
+    headers = {
+        "X-Key-Id": key_entry.key_id,
+        "X-Key-Peer-Id": key_entry.peer_id,
+        "X-Key-Type": key_entry.key_type,
+        "X-Key-Created-At": key_entry.created_at.isoformat(),
+        "X-Key-User-Id": key_entry.user_id,
+    }
+    if key_entry.expires_at:
+        headers["X-Key-Expires-At"] = key_entry.expires_at.isoformat()
+    return Response(
+        content=bytes(key_entry.key_material),
+        media_type=RAW_KEY_MEDIA_TYPE,
+        headers=headers,
+    )
+
 
 class KeyRequestBody(BaseModel):
     peer_id: str
@@ -27,6 +83,18 @@ class KeyResponse(BaseModel):
     user_id: str = "default"
 
 
+def _key_response(key_entry) -> KeyResponse:
+    return KeyResponse(
+        key_id=key_entry.key_id,
+        key_material=b64encode(key_entry.key_material).decode("ascii"),
+        peer_id=key_entry.peer_id,
+        key_type=key_entry.key_type,
+        created_at=key_entry.created_at.isoformat(),
+        expires_at=key_entry.expires_at.isoformat() if key_entry.expires_at else None,
+        user_id=key_entry.user_id,
+    )
+
+
 class KeyStatusResponse(BaseModel):
     key_id: str
     peer_id: str
@@ -40,9 +108,14 @@ class ConsumeResponse(BaseModel):
     consumed_at: str
 
 
+class DeleteResponse(BaseModel):
+    success: bool
+    zeroized_at: str
+
+
 class ProvisionRequest(BaseModel):
     key_type: str
-    size: int
+    size: int = Field(gt=0, le=1024 * 1024)
 
 
 class ProvisionResponse(BaseModel):
@@ -57,6 +130,8 @@ async def request_key(request: Request, body: KeyRequestBody):
     
     try:
         logger.info("Calling allocate_key in pool...")
+        # Stays on the loop: allocation hooks enqueue peer pushes on
+        # loop-owned asyncio.Queues.
         key_entry = key_pool.allocate_key(
             peer_id=body.peer_id,
             size=body.size,
@@ -70,15 +145,10 @@ async def request_key(request: Request, body: KeyRequestBody):
             key_entry.key_id, body.peer_id, body.key_type, body.size
         )
         
-        return KeyResponse(
-            key_id=key_entry.key_id,
-            key_material=base64.b64encode(key_entry.key_material).decode("ascii"),
-            peer_id=key_entry.peer_id,
-            key_type=key_entry.key_type,
-            created_at=key_entry.created_at.isoformat(),
-            expires_at=key_entry.expires_at.isoformat() if key_entry.expires_at else None,
-            user_id=key_entry.user_id,
-        )
+        if _wants_raw_key(request):
+            return _raw_key_response(key_entry)
+        
+        return _key_response(key_entry)
         
     except ValueError as e:
         logger.warning("Key request failed: %s", e)
@@ -88,6 +158,41 @@ async def request_key(request: Request, body: KeyRequestBody):
         )
 
 
+@router.post("/request:batch", response_model=List[KeyResponse])
+async def request_keys_batch(request: Request, body: List[KeyRequestBody]):
+    """Allocate one key per entry, in order, in a single round-trip."""
+    if not body or len(body) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch must contain 1-{MAX_BATCH_SIZE} key requests",
+        )
+    
+    key_pool = request.app.state.key_pool
+    
+    try:
+        # All or nothing: a failure partway through releases the keys
+        # already allocated instead of stranding them behind a 503.
+        entries = key_pool.allocate_key_batch([
+            {
+                "peer_id": item.peer_id,
+                "size": item.size,
+                "key_type": item.key_type,
+                "user_id": item.user_id,
+            }
+            for item in body
+        ])
+    except ValueError as e:
+        logger.warning("Batch key request failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
+    
+    logger.info("Allocated %d keys in batch", len(entries))
+    
+    return [_key_response(entry) for entry in entries]
+
+
 @router.get("/{key_id}", response_model=KeyResponse)
 async def get_key(request: Request, key_id: str):
     key_pool = request.app.state.key_pool
@@ -106,9 +211,12 @@ async def get_key(request: Request, key_id: str):
             detail=f"Key {key_id} has already been consumed (one-time use)",
         )
     
+    if _wants_raw_key(request):
+        return _raw_key_response(key_entry)
+    
     return KeyResponse(
         key_id=key_entry.key_id,
-        key_material=base64.b64encode(key_entry.key_material).decode("ascii"),
+        key_material=b64encode(key_entry.key_material).decode("ascii"),
         peer_id=key_entry.peer_id,
         key_type=key_entry.key_type,
         created_at=key_entry.created_at.isoformat(),
@@ -119,26 +227,25 @@ async def get_key(request: Request, key_id: str):
 async def consume_key(request: Request, key_id: str):
     key_pool = request.app.state.key_pool
     
-    success = key_pool.consume_key(key_id)
+    # Consuming persists the pool; keep the store rewrite off the event loop.
+    result = await asyncio.to_thread(key_pool.consume_key_status, key_id)
     
-    if not success:
-        key_entry = key_pool.get_key(key_id)
-        if key_entry is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Key {key_id} not found",
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_410_GONE,
-                detail=f"Key {key_id} already consumed",
-            )
+    if result == CONSUME_NOT_FOUND:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Key {key_id} not found",
+        )
+    if result != CONSUME_OK:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=f"Key {key_id} already consumed",
+        )
     
     logger.info("Key %s consumed (one-time use complete)", key_id)
     
     return ConsumeResponse(
         success=True,
-        consumed_at=datetime.now(timezone.utc).isoformat(),
+        consumed_at=_utcnow_iso(),
     )
 
 
@@ -152,50 +259,81 @@ class ExchangeKeyBody(BaseModel):
     expires_at: Optional[str] = None
 
 
-@router.post("/exchange", response_model=dict[str, bool])
-async def exchange_key(request: Request, body: ExchangeKeyBody):
+def _verify_link_secret(request: Request) -> None:
     # Verify the shared secret to ensure this comes from a trusted QKD node
-    expected_secret = request.app.state.settings.qkd_link_secret
+    expected_secret = settings.qkd_link_secret
     auth_header = request.headers.get("X-QKD-Link-Secret")
     
-    if not auth_header or auth_header != expected_secret:
-        logger.warning(f"Unauthorized key exchange attempt from {request.client.host}")
+    # Constant-time compare so response timing doesn't leak a matching prefix.
+    if not auth_header or not hmac.compare_digest(auth_header.encode(), expected_secret.encode()):
+        logger.warning("Unauthorized key exchange attempt from %s", request.client.host)
         raise HTTPException(status_code=403, detail="Invalid QKD Link Secret")
-        
+
+
+def _exchanged_entry(body: ExchangeKeyBody):
+    # Import manually to avoid circular imports
+    from core.key_pool import KeyEntry
+    
+    # Create KeyEntry from remote data
+    return KeyEntry(
+        key_id=body.key_id,
+        key_material=bytearray(b64decode(body.key_material_b64)),
+        peer_id=body.peer_id, # The sender (e.g., "km-remote")
+        key_type=body.key_type,
+        user_id=body.user_id,
+        created_at=datetime.fromisoformat(body.created_at),
+        expires_at=datetime.fromisoformat(body.expires_at) if body.expires_at else None
+    )
+
+
+@router.post("/exchange", response_model=dict[str, bool])
+async def exchange_key(request: Request, body: ExchangeKeyBody):
+    _verify_link_secret(request)
     key_pool = request.app.state.key_pool
     
     try:
-        # Import manually to avoid circular imports
-        from core.key_pool import KeyEntry
-        import base64
+        # Inject directly into pool, off the loop since it persists
+        await asyncio.to_thread(key_pool.inject_key, _exchanged_entry(body))
         
-        # Create KeyEntry from remote data
-        entry = KeyEntry(
-            key_id=body.key_id,
-            key_material=base64.b64decode(body.key_material_b64),
-            peer_id=body.peer_id, # The sender (e.g., "km-remote")
-            key_type=body.key_type,
-            user_id=body.user_id,
-            created_at=datetime.fromisoformat(body.created_at),
-            expires_at=datetime.fromisoformat(body.expires_at) if body.expires_at else None
-        )
-        
-        # Inject directly into pool
-        key_pool.inject_key(entry)
-        
-        logger.info(f"Received synchronized key {body.key_id} from {body.peer_id}")
+        logger.info("Received synchronized key %s from %s", body.key_id, body.peer_id)
         return {"success": True}
         
     except Exception as e:
-        logger.error(f"Failed to process exchanged key: {e}")
+        logger.error("Failed to process exchanged key: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/exchange:batch", response_model=dict[str, int])
+async def exchange_keys_batch(request: Request, body: List[ExchangeKeyBody]):
+    """Inject a page of keys pushed by a peer node in one request."""
+    _verify_link_secret(request)
+    if not body or len(body) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch must contain 1-{MAX_BATCH_SIZE} keys",
+        )
+    
+    key_pool = request.app.state.key_pool
+    
+    try:
+        # Off the loop: the batch ends in a persist.
+        injected = await asyncio.to_thread(
+            key_pool.inject_key_batch, [_exchanged_entry(item) for item in body]
+        )
+    except Exception as e:
+        logger.error("Failed to process exchanged key batch: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
+    
+    logger.info("Received %d synchronized keys from %s", injected, body[0].peer_id)
+    return {"injected": injected}
 
 
-@router.delete("/{key_id}")
+@router.delete("/{key_id}", response_model=DeleteResponse)
 async def delete_key(request: Request, key_id: str):
     key_pool = request.app.state.key_pool
     
-    success = key_pool.delete_key(key_id)
+    # Deleting persists the pool; keep the store rewrite off the event loop.
+    success = await asyncio.to_thread(key_pool.delete_key, key_id)
     
     if not success:
         raise HTTPException(
@@ -205,21 +343,22 @@ async def delete_key(request: Request, key_id: str):
     
     logger.warning("Key %s emergency deleted", key_id)
     
-    return {
-        "success": True,
-        "zeroized_at": datetime.now(timezone.utc).isoformat(),
-    }
+    return DeleteResponse(
+        success=True,
+        zeroized_at=_utcnow_iso(),
+    )
 
 
 @router.post("/provision", response_model=ProvisionResponse)
 async def provision_keys(request: Request, body: ProvisionRequest):
     key_pool = request.app.state.key_pool
     
+    # Provisioning draws entropy and persists, so it runs off the event loop.
     if body.key_type == "otp":
-        key_pool.add_otp_material(body.size)
+        await asyncio.to_thread(key_pool.add_otp_material, body.size)
         keys_added = body.size
     elif body.key_type == "aes":
-        key_pool.add_aes_keys(body.size)
+        await asyncio.to_thread(key_pool.add_aes_keys, body.size)
         keys_added = body.size
     else:
         keys_added = 0
@@ -22,6 +22,8 @@ class Settings(BaseSettings):
     
     host: str = "127.0.0.1"
     port: int = 8200
+    # Serve on a UNIX domain socket instead of host/port (co-located backend).
+    uds_path: Optional[Path] = Field(default=None)
     
     api_token: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
     
@@ -18,7 +18,11 @@ try:
     if backend_path.exists():
         sys.path.insert(0, str(backend_path))
     
-    from crypto_engine.quantum_sim import generate_quantum_bytes, health_check as entropy_health_check
+    from crypto_engine.quantum_sim import (
+        generate_quantum_bytes,
+        generate_quantum_bytes_into,
+        health_check as entropy_health_check,
+    )
     _HAS_QUANTUM_SIM = True
     logger.info("Quantum-grade entropy available for Key Manager")
     
@@ -35,7 +39,43 @@ def _secure_random(size: int) -> bytes:
     return os.urandom(size)
 
 
-@dataclass
+def _secure_random_into(buf: bytearray) -> None:
+    # Fills a preallocated pool in place; skips the bytes -> bytearray copy.
+    if not buf:
+        return
+    if _HAS_QUANTUM_SIM:
+        generate_quantum_bytes_into(buf)
+    else:
+        buf[:] = os.urandom(len(buf))
+
+
+# The OTP pool is one bytearray consumed front to back. Once the consumed
+# prefix is at least this large and covers half the pool, it is wiped and
+# dropped so auto-replenishment doesn't grow the pool without bound.
+_OTP_COMPACT_MIN_BYTES = 1 << 20
+
+# AES seeds are sliced from a prefilled buffer instead of one entropy call per
+# key; when it runs dry it is refilled with this many 32-byte seeds at once.
+_AES_SEED_BYTES = 32
+_AES_SEED_REFILL_KEYS = 256
+
+_KEY_TTL = timedelta(days=1)
+
+# consume_key_status() results, so callers can tell a missing key from a
+# spent one without a second lookup.
+CONSUME_OK = 0
+CONSUME_NOT_FOUND = 1
+CONSUME_ALREADY_CONSUMED = 2
+
+
+def _wipe(buf: bytearray) -> None:
+    # Same-length slice assignment overwrites the existing buffer in place
+    # (a single memcpy) rather than one Python-level store per byte.
+    buf[:] = bytes(len(buf))
+
+
+# slots=True: one entry per allocated key, so drop the per-instance __dict__.
+@dataclass(slots=True)
 class KeyEntry:
     key_id: str
     key_material: bytearray  # Mutable for zeroization
@@ -83,7 +123,14 @@ class KeyPool:
         self._otp_pool: bytearray = bytearray()
         self._otp_offset: int = 0
         self._aes_key_count: int = 0
+        self._aes_seed_pool: bytearray = bytearray()
+        self._aes_seed_offset: int = 0
         self._allocated_keys: Dict[str, KeyEntry] = {}
+        # to_dict() snapshot of every entry, refreshed only when that entry
+        # changes, so a persist doesn't re-encode the whole pool each time.
+        # Only filled when persisting: it holds base64 key material as
+        # immutable str, which _zeroize_key cannot wipe.
+        self._serialized_keys: Dict[str, Dict[str, Any]] = {}
         self._user_quotas: Dict[str, Dict[str, int]] = {}
         
         self._stats = {
@@ -113,6 +160,7 @@ class KeyPool:
                     for key_id, key_data in stored_data["keys"].items():
                         try:
                             self._allocated_keys[key_id] = KeyEntry.from_dict(key_data)
+                            self._serialized_keys[key_id] = key_data
                         except Exception as e:
                             logger.warning("Failed to restore key %s: %s", key_id, e)
                     
@@ -130,9 +178,12 @@ class KeyPool:
             source = "quantum-grade" if _HAS_QUANTUM_SIM else "classical PRNG"
             logger.info("Generating %d bytes of %s key material...", otp_bytes, source)
             
-            self._otp_pool = bytearray(_secure_random(otp_bytes))
+            self._otp_pool = bytearray(otp_bytes)
+            _secure_random_into(self._otp_pool)
             self._otp_offset = 0
             self._aes_key_count = aes_keys
+            # Same bound as add_aes_keys; _take_aes_seed refills the rest lazily.
+            self._refill_aes_seeds(min(aes_keys, _AES_SEED_REFILL_KEYS) * _AES_SEED_BYTES)
             
             self._persist()
             
@@ -145,26 +196,41 @@ class KeyPool:
     def inject_key(self, entry: KeyEntry) -> None:
         """Inject a key received from a peer QKD node."""
         with self._lock:
-            if entry.key_id in self._allocated_keys:
-                return # Already have it
-            
-            self._allocated_keys[entry.key_id] = entry
-            self._stats["total_allocated"] += 1
-            
-            # If it's an AES key, track it in stats (though logical consistency with count is tricky here)
-            if entry.key_type != "otp":
-                 # We don't decrement _aes_key_count because this is an *external* key
-                 pass
-            
-            self._persist()
-            
-            if self._audit_logger:
-                self._audit_logger.log("INJECT", entry.key_id, {
-                    "peer_id": entry.peer_id,
-                    "key_type": entry.key_type,
-                    "user_id": entry.user_id,
-                    "source": "qkd_link"
-                })
+            if self._inject_locked(entry):
+                self._persist()
+
+    def inject_key_batch(self, entries: List[KeyEntry]) -> int:
+        """Inject many peer keys under one lock hold and a single persist.
+        
+        Returns the number of keys that were new to this pool.
+        """
+        with self._lock:
+            injected = sum(1 for entry in entries if self._inject_locked(entry))
+            if injected:
+                self._persist()
+            return injected
+
+    def _inject_locked(self, entry: KeyEntry) -> bool:
+        if entry.key_id in self._allocated_keys:
+            return False # Already have it
+        
+        # Keep our own wipeable copy of material that arrived as bytes.
+        if not isinstance(entry.key_material, bytearray):
+            entry.key_material = bytearray(entry.key_material)
+        
+        # External keys don't draw down _aes_key_count; only the allocation total moves.
+        self._allocated_keys[entry.key_id] = entry
+        self._snapshot(entry)
+        self._stats["total_allocated"] += 1
+        
+        if self._audit_logger:
+            self._audit_logger.log("INJECT", entry.key_id, {
+                "peer_id": entry.peer_id,
+                "key_type": entry.key_type,
+                "user_id": entry.user_id,
+                "source": "qkd_link"
+            })
+        return True
 
     def allocate_key(
         self,
@@ -174,84 +240,157 @@ class KeyPool:
         user_id: str = "default",
     ) -> KeyEntry:
         with self._lock:
-            self._check_user_quota(user_id, key_type)
-            
-            if key_type == "otp":
-                available = len(self._otp_pool) - self._otp_offset
-                if available < size:
-                    replenish_amount = max(size * 2, 10240)  # Replenish with at least 10KB or twice the requested size
-                    logger.info(f"Insufficient OTP key material (Req: {size}, Avail: {available}). Auto-replenishing {replenish_amount} bytes...")
-                    new_material = _secure_random(replenish_amount)
-                    self._otp_pool.extend(new_material)
-                    available = len(self._otp_pool) - self._otp_offset
-                    self._persist()
-                
-                key_material = bytearray(
-                    self._otp_pool[self._otp_offset:self._otp_offset + size]
-                )
-                self._otp_offset += size
-                self._stats["otp_bytes_used"] += size
-                
-            else:
-                if self._aes_key_count <= 0:
-                    self._aes_key_count = 1000
-                    logger.info("Auto-replenished AES key count")
-                
-                key_material = bytearray(_secure_random(size))
-                self._aes_key_count -= 1
-                self._stats["aes_keys_used"] += 1
-            
-            key_id = str(uuid4())
-            now = datetime.now(timezone.utc)
-            
-            entry = KeyEntry(
-                key_id=key_id,
-                key_material=key_material,
-                peer_id=peer_id,
-                key_type=key_type,
-                user_id=user_id,
-                created_at=now,
-                expires_at=now + timedelta(days=1),
-            )
+            entry = self._allocate_locked(peer_id, size, key_type, user_id)
+            self._compact_otp_pool()
+            self._persist()
+            self._log_allocation(entry, size)
+            self._run_allocation_hooks(entry)
+            return entry
+    
+    def allocate_key_batch(self, requests: List[Dict[str, Any]]) -> List[KeyEntry]:
+        """Allocate one key per allocate_key() kwargs dict, all or nothing.
+        
+        If any allocation fails, the keys already taken for the batch are
+        zeroized and the pool counters, OTP offset and user quotas are put
+        back as they were before the error is re-raised. The pool is
+        persisted, audited and hooked only once, for the batch as a whole,
+        so peers never receive keys the caller was refused.
+        """
+        with self._lock:
+            stats = self._stats.copy()
+            otp_offset = self._otp_offset
+            aes_key_count = self._aes_key_count
+            user_ids = {request.get("user_id", "default") for request in requests}
+            quotas = {
+                user_id: dict(self._user_quotas[user_id])
+                for user_id in user_ids if user_id in self._user_quotas
+            }
             
-            self._allocated_keys[key_id] = entry
-            self._stats["total_allocated"] += 1
-            self._update_user_quota(user_id, key_type, 1)
+            entries: List[KeyEntry] = []
+            try:
+                for request in requests:
+                    entries.append(self._allocate_locked(**request))
+            except Exception:
+                for entry in entries:
+                    del self._allocated_keys[entry.key_id]
+                    self._serialized_keys.pop(entry.key_id, None)
+                    self._zeroize_key(entry)
+                self._stats = stats
+                self._otp_offset = otp_offset
+                self._aes_key_count = aes_key_count
+                for user_id in user_ids:
+                    if user_id in quotas:
+                        self._user_quotas[user_id] = quotas[user_id]
+                    else:
+                        self._user_quotas.pop(user_id, None)
+                self._persist()
+                raise
             
+            self._compact_otp_pool()
             self._persist()
+            for request, entry in zip(requests, entries):
+                self._log_allocation(entry, request["size"])
+            for entry in entries:
+                self._run_allocation_hooks(entry)
+            return entries
+    
+    def _allocate_locked(
+        self,
+        peer_id: str,
+        size: int,
+        key_type: str = "aes_seed",
+        user_id: str = "default",
+    ) -> KeyEntry:
+        self._check_user_quota(user_id, key_type)
+        
+        if key_type == "otp":
+            available = len(self._otp_pool) - self._otp_offset
+            if available < size:
+                replenish_amount = max(size * 2, 10240)  # Replenish with at least 10KB or twice the requested size
+                logger.info(
+                    "Insufficient OTP key material (Req: %d, Avail: %d). Auto-replenishing %d bytes...",
+                    size, available, replenish_amount,
+                )
+                new_material = _secure_random(replenish_amount)
+                self._otp_pool.extend(new_material)
+                available = len(self._otp_pool) - self._otp_offset
             
-            if self._audit_logger:
-                self._audit_logger.log("ALLOCATE", key_id, {
-                    "peer_id": peer_id,
-                    "key_type": key_type,
-                    "size": size,
-                    "user_id": user_id,
-                })
+            # Copy straight out of the pool; slicing the bytearray
+            # first would make a second, intermediate copy.
+            with memoryview(self._otp_pool) as pool_view:
+                key_material = bytearray(
+                    pool_view[self._otp_offset:self._otp_offset + size]
+                )
+            self._otp_offset += size
+            self._stats["otp_bytes_used"] += size
             
-            # Trigger hooks for distributed sync
-            for hook in self._allocation_hooks:
-                try:
-                    hook(peer_id, entry)
-                except Exception as e:
-                    logger.error(f"Error in allocation hook: {e}")
+        else:
+            if self._aes_key_count <= 0:
+                self._aes_key_count = 1000
+                logger.info("Auto-replenished AES key count")
             
-            return entry
+            key_material = self._take_aes_seed(size)
+            self._aes_key_count -= 1
+            self._stats["aes_keys_used"] += 1
+        
+        key_id = str(uuid4())
+        now = datetime.now(timezone.utc)
+        
+        entry = KeyEntry(
+            key_id=key_id,
+            key_material=key_material,
+            peer_id=peer_id,
+            key_type=key_type,
+            user_id=user_id,
+            created_at=now,
+            expires_at=now + _KEY_TTL,
+        )
+        
+        self._allocated_keys[key_id] = entry
+        self._snapshot(entry)
+        self._stats["total_allocated"] += 1
+        self._update_user_quota(user_id, key_type, 1)
+        
+        # Callers compact, persist and audit once the allocation is final.
+        return entry
+    
+    def _log_allocation(self, entry: KeyEntry, size: int) -> None:
+        if self._audit_logger:
+            self._audit_logger.log("ALLOCATE", entry.key_id, {
+                "peer_id": entry.peer_id,
+                "key_type": entry.key_type,
+                "size": size,
+                "user_id": entry.user_id,
+            })
+    
+    def _run_allocation_hooks(self, entry: KeyEntry) -> None:
+        # Trigger hooks for distributed sync
+        for hook in self._allocation_hooks:
+            try:
+                hook(entry.peer_id, entry)
+            except Exception as e:
+                logger.error("Error in allocation hook: %s", e)
     
     def get_key(self, key_id: str) -> Optional[KeyEntry]:
-        with self._lock:
-            return self._allocated_keys.get(key_id)
+        # A single dict lookup is atomic, so reads skip the pool lock and do
+        # not queue behind allocations.
+        return self._allocated_keys.get(key_id)
     
     def consume_key(self, key_id: str) -> bool:
+        return self.consume_key_status(key_id) == CONSUME_OK
+    
+    def consume_key_status(self, key_id: str) -> int:
         with self._lock:
             entry = self._allocated_keys.get(key_id)
             if entry is None:
-                return False
+                return CONSUME_NOT_FOUND
             
             if entry.consumed:
-                return False
+                return CONSUME_ALREADY_CONSUMED
             
             entry.consumed = True
             entry.consumed_at = datetime.now(timezone.utc)
+            self._snapshot(entry)
             self._stats["total_consumed"] += 1
             
             self._persist()
@@ -263,11 +402,12 @@ class KeyPool:
                     "user_id": entry.user_id,
                 })
             
-            return True
+            return CONSUME_OK
     
     def delete_key(self, key_id: str) -> bool:
         with self._lock:
             entry = self._allocated_keys.pop(key_id, None)
+            self._serialized_keys.pop(key_id, None)
             if entry:
                 self._zeroize_key(entry)
                 self._persist()
@@ -292,6 +432,12 @@ class KeyPool:
     def add_aes_keys(self, count: int) -> None:
         with self._lock:
             self._aes_key_count += count
+            # Top up the next refill batch of seeds now, off the allocation
+            # path; beyond that _take_aes_seed refills lazily, so a large
+            # count doesn't allocate count * 32 bytes up front.
+            self._reserve_aes_seeds(
+                min(self._aes_key_count, _AES_SEED_REFILL_KEYS) * _AES_SEED_BYTES
+            )
             self._persist()
             logger.info("Added %d AES keys", count)
     
@@ -299,8 +445,8 @@ class KeyPool:
         with self._lock:
             stats = {
                 "otp_available": len(self._otp_pool) - self._otp_offset,
-                "otp_total": len(self._otp_pool),
-                "otp_used": self._otp_offset,
+                "otp_total": len(self._otp_pool) - self._otp_offset + self._stats["otp_bytes_used"],
+                "otp_used": self._stats["otp_bytes_used"],
                 "aes_available": self._aes_key_count,
                 "total_allocated": self._stats["total_allocated"],
                 "total_consumed": self._stats["total_consumed"],
@@ -308,14 +454,16 @@ class KeyPool:
                 "persistence_enabled": self._persistence_enabled,
                 "quantum_entropy": _HAS_QUANTUM_SIM,
             }
-            
-            if _HAS_QUANTUM_SIM:
-                try:
-                    stats["entropy_healthy"] = entropy_health_check()
-                except:
-                    stats["entropy_healthy"] = True
-            
-            return stats
+        
+        # The entropy self-test samples and scores 256 bytes; run it outside
+        # the pool lock so status polls don't hold up allocations.
+        if _HAS_QUANTUM_SIM:
+            try:
+                stats["entropy_healthy"] = entropy_health_check()
+            except:
+                stats["entropy_healthy"] = True
+        
+        return stats
     
     def get_user_stats(self, user_id: str) -> Dict[str, Any]:
         with self._lock:
@@ -339,6 +487,7 @@ class KeyPool:
             
             for key_id in expired:
                 entry = self._allocated_keys.pop(key_id)
+                self._serialized_keys.pop(key_id, None)
                 self._zeroize_key(entry)
                 
                 if self._audit_logger:
@@ -354,15 +503,21 @@ class KeyPool:
     def shutdown(self) -> None:
         with self._lock:
             self._persist()
+            if self._audit_logger:
+                self._audit_logger.flush()
             
-            for i in range(len(self._otp_pool)):
-                self._otp_pool[i] = 0
+            _wipe(self._otp_pool)
+            _wipe(self._aes_seed_pool)
             
             for entry in self._allocated_keys.values():
                 self._zeroize_key(entry)
             
             logger.info("Key pool shutdown complete - all keys zeroized")
     
+    def _snapshot(self, entry: KeyEntry) -> None:
+        if self._persistence_enabled and self._persistent_store:
+            self._serialized_keys[entry.key_id] = entry.to_dict()
+    
     def _persist(self) -> None:
         if not self._persistence_enabled or not self._persistent_store:
             return
@@ -370,15 +525,10 @@ class KeyPool:
         try:
             import base64
             
-            keys_data = {
-                key_id: entry.to_dict()
-                for key_id, entry in self._allocated_keys.items()
-            }
-            
             data = {
-                "keys": keys_data,
+                "keys": self._serialized_keys,
                 "stats": self._stats.copy(),
-                "otp_pool_b64": base64.b64encode(bytes(self._otp_pool)).decode(),
+                "otp_pool_b64": base64.b64encode(self._otp_pool).decode(),
                 "otp_offset": self._otp_offset,
                 "aes_key_count": self._aes_key_count,
             }
@@ -388,20 +538,55 @@ class KeyPool:
         except Exception as e:
             logger.error("Failed to persist key pool: %s", e)
     
+    def _compact_otp_pool(self) -> None:
+        offset = self._otp_offset
+        if offset < _OTP_COMPACT_MIN_BYTES or offset * 2 < len(self._otp_pool):
+            return
+        
+        with memoryview(self._otp_pool) as pool_view:
+            pool_view[:offset] = bytes(offset)
+        # Deleting a bytearray prefix only advances its start pointer.
+        del self._otp_pool[:offset]
+        self._otp_offset = 0
+        logger.debug("Reclaimed %d bytes of consumed OTP material", offset)
+    
+    def _refill_aes_seeds(self, size: int) -> None:
+        # Carry over seeds that were drawn but not served yet and only draw
+        # entropy for the rest.
+        remaining = len(self._aes_seed_pool) - self._aes_seed_offset
+        seeds = bytearray(size)
+        with memoryview(self._aes_seed_pool) as old_view, memoryview(seeds) as new_view:
+            new_view[:remaining] = old_view[self._aes_seed_offset:]
+            _secure_random_into(new_view[remaining:])
+        _wipe(self._aes_seed_pool)
+        self._aes_seed_pool = seeds
+        self._aes_seed_offset = 0
+    
+    def _reserve_aes_seeds(self, size: int) -> None:
+        if len(self._aes_seed_pool) - self._aes_seed_offset < size:
+            self._refill_aes_seeds(size)
+    
+    def _take_aes_seed(self, size: int) -> bytearray:
+        if len(self._aes_seed_pool) - self._aes_seed_offset < size:
+            self._refill_aes_seeds(max(size, _AES_SEED_REFILL_KEYS * _AES_SEED_BYTES))
+        
+        start = self._aes_seed_offset
+        self._aes_seed_offset = start + size
+        with memoryview(self._aes_seed_pool) as seed_view:
+            seed = bytearray(seed_view[start:start + size])
+            # Handed-out material must not linger in the shared buffer.
+            seed_view[start:start + size] = bytes(size)
+        return seed
+    
     def _zeroize_key(self, entry: KeyEntry) -> None:
-        if isinstance(entry.key_material, (bytes, bytearray)):
-            # Convert to bytearray if it's bytes (though it should be bytearray by now)
-            if isinstance(entry.key_material, bytes):
-                entry.key_material = bytearray(entry.key_material)
-            
-            # Valid zeroization for bytearray
-            if isinstance(entry.key_material, bytearray):
-                for i in range(len(entry.key_material)):
-                    entry.key_material[i] = 0
-            
-            # Explicitly clear reference
-            entry.key_material = bytearray()
-            logger.debug(f"Zeroized key {entry.key_id}")
+        # Pool-held material is always a bytearray (see _inject_locked), so it
+        # is wiped in place; copying immutable bytes first would wipe the copy.
+        if isinstance(entry.key_material, bytearray):
+            _wipe(entry.key_material)
+        
+        # Explicitly clear reference
+        entry.key_material = bytearray()
+        logger.debug("Zeroized key %s", entry.key_id)
     
     def _check_user_quota(self, user_id: str, key_type: str) -> None:
         pass
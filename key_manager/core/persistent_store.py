@@ -15,6 +15,11 @@ PBKDF2_ITERATIONS = 480000
 SALT_SIZE = 16
 STORE_VERSION = 1
 
+# Audit records are buffered and appended in one write + fsync once this
+# much is pending, or this long after the first unflushed record.
+AUDIT_FLUSH_BYTES = 64 * 1024
+AUDIT_FLUSH_INTERVAL = 0.1
+
 
 def _derive_key(password: str, salt: bytes) -> bytes:
     from cryptography.hazmat.primitives import hashes
@@ -96,9 +101,7 @@ class PersistentKeyStore:
             return {"keys": {}, "stats": {}, "version": STORE_VERSION}
     
     def save(self, data: Dict[str, Any]) -> None:
-        logger.info("[PersistentKeyStore] Waiting for lock in save")
         with self._lock:
-            logger.info("[PersistentKeyStore] Acquired lock in save")
             if not self._initialized:
                 raise RuntimeError("Store not initialized")
             
@@ -158,6 +161,9 @@ class AuditLogger:
         self._path = path
         self._lock = threading.Lock()
         self._hash_chain: Optional[str] = None
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._flush_timer: Optional[threading.Timer] = None
         
         self._path.parent.mkdir(parents=True, exist_ok=True)
         
@@ -184,13 +190,43 @@ class AuditLogger:
             }
             
             entry_json = json.dumps(entry, sort_keys=True)
-            entry["hash"] = hashlib.sha256(entry_json.encode()).hexdigest()[:32]
-            self._hash_chain = entry["hash"]
+            self._hash_chain = hashlib.sha256(entry_json.encode()).hexdigest()[:32]
+            
+            # The stored line is the hashed JSON with "hash" appended, so the
+            # record is serialised once; verify_chain re-sorts keys anyway.
+            line = f'{entry_json[:-1]}, "hash": "{self._hash_chain}"}}\n'
+            self._pending.append(line)
+            self._pending_bytes += len(line)
             
-            with open(self._path, "a") as f:
-                f.write(json.dumps(entry) + "\n")
+            if self._pending_bytes >= AUDIT_FLUSH_BYTES:
+                self._flush_locked()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(AUDIT_FLUSH_INTERVAL, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+    
+    def _flush_locked(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        
+        if not self._pending:
+            return
+        
+        with open(self._path, "a") as f:
+            f.write("".join(self._pending))
+            f.flush()
+            os.fsync(f.fileno())
+        
+        self._pending.clear()
+        self._pending_bytes = 0
     
     def verify_chain(self) -> bool:
+        self.flush()
         if not self._path.exists():
             return True
         
@@ -219,6 +255,7 @@ class AuditLogger:
         return True
     
     def get_entries(self, key_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        self.flush()
         if not self._path.exists():
             return []
         
@@ -3,7 +3,7 @@ import base64
 import logging
 import json
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 import httpx
 
@@ -11,6 +11,22 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 lets concurrent pushes to a peer share one connection; it needs the
+# optional h2 package (httpx[http2]), otherwise the link stays on HTTP/1.1.
+try:
+    import h2  # noqa: F401
+    _HAS_H2 = True
+except ImportError:
+    _HAS_H2 = False
+
+# Pushed keys are queued per peer and sent by one worker per peer in batches
+# of up to _PUSH_BATCH_SIZE (the receiver accepts 100), waiting at most
+# _PUSH_BATCH_WINDOW seconds to fill a batch.
+_PUSH_BATCH_SIZE = 64
+_PUSH_BATCH_WINDOW = 0.02
+_PUSH_QUEUE_SIZE = 4096
+_SHUTDOWN_FLUSH_TIMEOUT = 5.0
+
 
 class QKDLink:
     """
@@ -32,10 +48,20 @@ class QKDLink:
         self._httpx_kwargs = {
             "timeout": 10.0,
             "verify": verify,
-            "cert": cert
+            "cert": cert,
+            "http2": _HAS_H2,
+            "limits": httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64,
+                keepalive_expiry=60.0,
+            ),
         }
+        # One pooled client for every peer: pushes reuse kept-alive
+        # connections instead of reconnecting (and re-handshaking mTLS).
         self._http_client = None
         self._background_tasks = set()
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
     
     @property
     def http_client(self):
@@ -51,10 +77,10 @@ class QKDLink:
         # Check if we have a configured URL for this peer
         peer_url = settings.peers.get(peer_id)
         if not peer_url:
-            logger.debug(f"No configured QKD link for peer {peer_id}, skipping push")
+            logger.debug("No configured QKD link for peer %s, skipping push", peer_id)
             return False
             
-        logger.info(f"QKD LINK: Pushing key {key_entry.key_id} to {peer_id} ({peer_url})")
+        logger.info("QKD LINK: Pushing key %s to %s (%s)", key_entry.key_id, peer_id, peer_url)
         
         # Prepare the payload
         # In simulating a QKD link, we send the key material securely
@@ -70,27 +96,106 @@ class QKDLink:
             "source": "qkd_link_push"
         }
         
-        # Fire and forget (or rather, fire and log) to avoid blocking the main thread
-        # In a robust system, this would go into a durable queue (Redpanda/RabbitMQ)
+        # Fire and forget: the key is queued and the per-peer worker sends it
+        # with whatever else arrives in the batch window. In a robust system,
+        # this would go into a durable queue (Redpanda/RabbitMQ).
         
-        # We are called from a synchronous context (key_pool.allocate_key inside a lock),
-        # so we cannot use asyncio.create_task directly without an event loop context.
-        # So we use asyncio.run_coroutine_threadsafe or fire it in a background thread
-        # if there is no running loop.
+        # We are called from a synchronous context (key_pool.allocate_key inside a lock).
+        # Without a running event loop, fall back to a one-off send on a background thread.
         try:
             loop = asyncio.get_running_loop()
-            task = loop.create_task(self._send_key(peer_url, payload))
-            self._background_tasks.add(task)
-            task.add_done_callback(self._background_tasks.discard)
         except RuntimeError:
             import threading
             def run_in_new_loop():
-                asyncio.run(self._send_key(peer_url, payload))
+                # The shared client belongs to the main loop; use a
+                # throwaway one on this thread's loop.
+                asyncio.run(self._send_key_once(peer_url, payload))
             threading.Thread(target=run_in_new_loop, daemon=True).start()
+            return True
+        
+        queue = self._queues.get(peer_id)
+        if queue is None:
+            queue = self._queues[peer_id] = asyncio.Queue(maxsize=_PUSH_QUEUE_SIZE)
+        
+        worker = self._workers.get(peer_id)
+        if worker is None or worker.done():
+            worker = loop.create_task(self._push_worker(peer_url, queue))
+            self._workers[peer_id] = worker
+            self._background_tasks.add(worker)
+            worker.add_done_callback(self._background_tasks.discard)
+        
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning("QKD LINK: Push queue for %s is full, dropping key %s", peer_id, key_entry.key_id)
+            return False
             
         return True
+    
+    async def _push_worker(self, url: str, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + _PUSH_BATCH_WINDOW
+            
+            while len(batch) < _PUSH_BATCH_SIZE:
+                try:
+                    batch.append(queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._send_batch(url, batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _send_batch(self, url: str, payloads: List[Dict[str, Any]]) -> None:
+        try:
+            headers = {
+                "X-QKD-Link-Secret": settings.qkd_link_secret,
+                "Content-Type": "application/json"
+            }
+            
+            response = await self.http_client.post(
+                f"{url}/api/v1/keys/exchange:batch",
+                json=payloads,
+                headers=headers
+            )
+            
+            if response.status_code == 200:
+                logger.info("QKD LINK: Successfully synchronized %d keys", len(payloads))
+            else:
+                logger.warning(
+                    "QKD LINK: Failed to sync %d keys: %s", len(payloads), response.status_code
+                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("QKD LINK: Peer response body: %s", response.text)
+                
+        except Exception as e:
+            logger.error("QKD LINK: Connection error pushing %d keys: %s", len(payloads), e)
+    
+    async def flush(self) -> None:
+        """Wait until every queued key has been sent (or failed to send)."""
+        for queue in list(self._queues.values()):
+            await queue.join()
         
-    async def _send_key(self, url: str, payload: Dict[str, Any]) -> None:
+    async def _send_key_once(self, url: str, payload: Dict[str, Any]) -> None:
+        async with httpx.AsyncClient(**self._httpx_kwargs) as client:
+            await self._send_key(url, payload, client)
+    
+    async def _send_key(
+        self, url: str, payload: Dict[str, Any], client: Optional[httpx.AsyncClient] = None
+    ) -> None:
         try:
             # Add authentication (simulating mutual authentication of QKD nodes)
             headers = {
@@ -98,23 +203,39 @@ class QKDLink:
                 "Content-Type": "application/json"
             }
             
-            response = await self.http_client.post(
+            response = await (client or self.http_client).post(
                 f"{url}/api/v1/keys/exchange", 
                 json=payload,
                 headers=headers
             )
             
             if response.status_code == 200:
-                logger.info(f"QKD LINK: Successfully synchronized key {payload['key_id']}")
+                logger.info("QKD LINK: Successfully synchronized key %s", payload["key_id"])
             else:
-                logger.warning(f"QKD LINK: Failed to sync key {payload['key_id']}: {response.status_code} {response.text}")
+                logger.warning(
+                    "QKD LINK: Failed to sync key %s: %s", payload["key_id"], response.status_code
+                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("QKD LINK: Peer response body: %s", response.text)
                 
         except Exception as e:
-            logger.error(f"QKD LINK: Connection error pushing key: {e}")
+            logger.error("QKD LINK: Connection error pushing key: %s", e)
             
     async def shutdown(self):
+        try:
+            await asyncio.wait_for(self.flush(), timeout=_SHUTDOWN_FLUSH_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("QKD LINK: Gave up flushing pending key pushes on shutdown")
+        
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+        
         if self._http_client is not None:
             await self._http_client.aclose()
+            self._http_client = None
         
     
 # Global instance
@@ -128,19 +128,10 @@ async def lifespan(app: FastAPI):
     from core.qkd_link import get_qkd_link
     qkd_link = get_qkd_link()
     
-    # Register hook: When we create a key, push it to the peer via QKD Link
-    async def sync_key_to_peer(peer_id, key_entry):
-        await qkd_link.push_key(peer_id, key_entry)
-        
-    def sync_hook_wrapper(peer_id, key_entry):
-        # Fire-and-forget async call from synchronous hook
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(sync_key_to_peer(peer_id, key_entry))
-        except RuntimeError:
-            pass # No loop running
-            
-    key_pool.register_allocation_hook(sync_hook_wrapper)
+    # Register hook: When we create a key, push it to the peer via QKD Link.
+    # push_key only queues the key, so it is safe to call from the
+    # synchronous allocation path.
+    key_pool.register_allocation_hook(qkd_link.push_key)
     
     app.state.key_pool = key_pool
     
@@ -238,11 +229,15 @@ if __name__ == "__main__":
         else:
             logger.warning("TLS Enabled but no CA file provided - Client Auth NOT enforced")
 
+    bind_config = {"host": settings.host, "port": settings.port}
+    if settings.uds_path:
+        bind_config = {"uds": str(settings.uds_path)}
+        logger.info("Serving on UNIX socket %s", settings.uds_path)
+
     uvicorn.run(
         "main:app",
-        host=settings.host,
-        port=settings.port,
         reload=settings.debug,
         log_level="debug" if settings.debug else "info",
+        **bind_config,
         **ssl_config,
     )